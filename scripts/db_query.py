@@ -77,7 +77,7 @@ def show_stats():
 def show_filesize():
     """Show database file size"""
     print("=== DATABASE FILE SIZE ===")
-    db_path = Path(Config.DATABASE_PATH)
+    db_path = Config.DATABASE_PATH
 
     if not db_path.exists():
         print(f"Database file not found at: {Config.DATABASE_PATH}")
@@ -10,18 +10,20 @@ import aiohttp
 import google.genai as genai
 from google.genai import types
 
-from utils.config import PROMPT_DIR, Config
+from utils.config import Config
 from utils.constants import (
     AI_DEFAULT_TEMPERATURE,
     AI_MAX_IMAGE_UPLOAD,
     AI_MAX_RESPONSE_CHARS,
     AI_MAX_TOKENS,
+    AI_RANDOM_REPLY_MAX_TOKENS,
     AI_RESPONSE_TRUNCATE_TO,
     AI_TOP_K,
     AI_TOP_P,
     MAX_MESSAGE_CONTEXT_FOR_AI,
 )
 from utils.logger import setup_logger
+from utils.prompts import load_prompt
 
 logger = setup_logger()
 
@@ -57,12 +59,10 @@ class AIClient:
     def _load_system_prompt(self, prompt_file: str = "conversation.txt") -> str:
         """Load a system prompt from prompts directory"""
         try:
-            prompt_path = PROMPT_DIR / prompt_file
-            if prompt_path.exists():
-                return prompt_path.read_text().strip()
-            else:
-                logger.warning(f"{prompt_file} not found, using default system prompt")
-                return "You are Frank, an AI in a Discord chat."
+            return load_prompt(prompt_file)
+        except FileNotFoundError:
+            logger.warning(f"{prompt_file} not found, using default system prompt")
+            return "You are Frank, an AI in a Discord chat."
         except Exception as e:
             logger.error(f"Failed to load system prompt: {e}")
             return "You are Frank, an AI in a Discord chat."
@@ -151,8 +151,7 @@ class AIClient:
         if Config.ENABLE_PERSONALITY_FEATURE and user_personality:
             from personality_manager import PersonalityManager
 
-            personality_mgr = PersonalityManager("")
-            personality_text = personality_mgr.format_personality_for_prompt(user_personality)
+            personality_text = PersonalityManager.format_personality_for_prompt(user_personality)
             if personality_text:
                 context_parts.append(personality_text)
 
@@ -351,12 +350,26 @@ class AIClient:
             raise
 
     async def _generate_conversation_response(
-        self, formatted_context: str, image_urls: list[str] | None = None
+        self,
+        formatted_context: str,
+        image_urls: list[str] | None = None,
+        system_prompt: str | None = None,
+        personality_prompt: str | None = None,
     ) -> str | None:
-        """Generate conversational response with tools and image support enabled"""
-        combined_prompt = self.system_prompt
-        if Config.ENABLE_PERSONALITY_FEATURE and self.personality_prompt:
-            combined_prompt = f"{self.system_prompt}\n\n{self.personality_prompt}"
+        """
+        Generate conversational response with tools and image support enabled
+
+        system_prompt and personality_prompt override the client defaults for this call only,
+        so callers never need to mutate shared client state.
+        """
+        if system_prompt is None:
+            system_prompt = self.system_prompt
+        if personality_prompt is None:
+            personality_prompt = self.personality_prompt
+
+        combined_prompt = system_prompt
+        if Config.ENABLE_PERSONALITY_FEATURE and personality_prompt:
+            combined_prompt = f"{system_prompt}\n\n{personality_prompt}"
 
         return await self._generate_with_config(
             formatted_context=formatted_context,
@@ -469,7 +482,7 @@ class AIClient:
                         dt = datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp
                         time_str = dt.strftime("%H:%M")
                     except Exception as te:
-                        logger.debug(f"Failed to parse timestamp {timestamp}: {te}")
+                        logger.debug("Failed to parse timestamp %s: %s", timestamp, te)
                         time_str = "??:??"
                 else:
                     time_str = "??:??"
@@ -498,6 +511,30 @@ class AIClient:
             logger.error(f"Error generating summary: {e}", exc_info=True)
             return None
 
+    async def generate_selection_response(self, formatted_context: str, system_prompt: str) -> str | None:
+        """
+        Ask the AI to pick a message from the context and respond to it (random replies and reacts)
+
+        Args:
+            formatted_context: Candidate messages, one "[ID: ...]" line each
+            system_prompt: Prompt describing the expected REPLY_TO/REACT_TO response format
+
+        Returns:
+            Raw AI response text or None if AI unavailable
+        """
+        if not self.client:
+            logger.error("AI client is not available")
+            return None
+
+        return await self._generate_with_config(
+            formatted_context=formatted_context,
+            system_prompt=system_prompt,
+            image_urls=None,
+            enable_tools=False,
+            temperature=1.0,
+            max_tokens=AI_RANDOM_REPLY_MAX_TOKENS,
+        )
+
     def get_model_info(self) -> dict:
         """Get information about the current AI model"""
         return {
@@ -1,6 +1,8 @@
 """Main Discord bot entry point for Frank the Chatter"""
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import logging
 from pathlib import Path
 import random
 import sys
@@ -16,6 +18,7 @@ from ai_client import AIClient
 from commands import CommandHandler
 from message_storage import MessageStorage
 from utils.constants import (
+    DB_SIZE_CHECK_INTERVAL,
     LOG_MESSAGE_PREVIEW_LENGTH,
     MAX_MESSAGE_CONTEXT_FOR_AI,
     RANDOM_REACT_MESSAGE_COUNT,
@@ -37,6 +40,8 @@ class FrankBot(discord.Client):
         )
 
         self.message_storage = MessageStorage()
+        # A single writer thread keeps inserts off the event loop while preserving message order
+        self._db_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
         logger.info("Database storage initialized")
 
         self.ai_client = AIClient()
@@ -54,10 +59,13 @@ class FrankBot(discord.Client):
         )
         logger.info("Command handler initialized")
 
+        self.random_reply_handle = None
         self.random_reply_task = None
         self.random_react_task = None
         self.channel_cleanup_task = None
+        self.db_size_check_task = None
         self.channel_message_counts = {}
+        self._bot_user_id = None
 
     async def on_ready(self):
         """Called when bot connects successfully"""
@@ -68,6 +76,8 @@ class FrankBot(discord.Client):
             logger.error("Bot user is None after connecting")
             return
 
+        self._bot_user_id = self.user.id
+
         logger.info(f"Bot logged in as {self.user} (ID: {self.user.id})")
         logger.info(f"Bot is connected to {len(self.guilds)} servers")
 
@@ -80,21 +90,26 @@ class FrankBot(discord.Client):
         logger.info(
             f"Database size: {db_info.get('size_mb', 0):.1f}MB, Total messages: {db_info.get('total_messages', 0)}"
         )
-        for stat in stats[:TOP_CHANNELS_TO_SHOW]:
-            channel_name = stat.get("channel_name", "Unknown")
-            logger.info(f"  Channel {channel_name} ({stat['channel_id']}): {stat['message_count']} messages")
-
-        if self.random_reply_task is None:
+        if stats:
+            top_channels = "\n".join(
+                f"  Channel {stat.get('channel_name', 'Unknown')} ({stat['channel_id']}): "
+                f"{stat['message_count']} messages"
+                for stat in stats[:TOP_CHANNELS_TO_SHOW]
+            )
+            logger.info("Top channels:\n%s", top_channels)
+
+        if self.random_reply_handle is None:
             from commands.random_reply import RandomReply
 
-            self.random_reply = RandomReply(self, self.message_storage, self.ai_client)
-            self.random_reply_task = asyncio.create_task(self._random_reply_scheduler())
+            # Constructors read their prompt files, so keep that disk I/O off the event loop
+            self.random_reply = await asyncio.to_thread(RandomReply, self, self.message_storage, self.ai_client)
+            self._schedule_random_reply()
             logger.info("Random reply scheduler started")
 
         if self.random_react_task is None:
             from random_react import RandomReact
 
-            self.random_react = RandomReact(self, self.ai_client)
+            self.random_react = await asyncio.to_thread(RandomReact, self, self.ai_client)
             logger.info(f"Random react initialized (triggers every {RANDOM_REACT_MESSAGE_COUNT} messages per channel)")
 
         if self.channel_cleanup_task is None:
@@ -102,12 +117,15 @@ class FrankBot(discord.Client):
             self.channel_cleanup_task = asyncio.create_task(self._channel_cleanup_scheduler())
             logger.info("Channel cleanup running on startup and scheduled for every 24 hours")
 
+        if self.db_size_check_task is None:
+            self.db_size_check_task = asyncio.create_task(self._db_size_check_scheduler())
+
         self.command_handler.set_bot(self)
 
     async def on_message(self, message):
         await self._store_message(message)
 
-        if message.author == self.user:
+        if message.author.id == self._bot_user_id:
             return
 
         channel_id = str(message.channel.id)
@@ -120,29 +138,36 @@ class FrankBot(discord.Client):
                 task.add_done_callback(lambda t: t.exception() if not t.cancelled() else None)
 
         if self.user and self.user.mentioned_in(message):
-            await self._handle_mention(message)
+            await self._handle_mention(message, channel_id)
 
     async def _store_message(self, message):
         try:
-            self.message_storage.store_message(message)
-
-            channel_name = getattr(message.channel, "name", f"Channel-{message.channel.id}")
-            preview = message.content[:LOG_MESSAGE_PREVIEW_LENGTH]
-            overflow = "..." if len(message.content) > LOG_MESSAGE_PREVIEW_LENGTH else ""
-            log_msg = f"[{channel_name}] {message.author.display_name}: {preview}{overflow}"
-            if message.attachments:
-                log_msg += f" [{len(message.attachments)} attachment(s)]"
-            logger.debug(log_msg)
+            await asyncio.get_running_loop().run_in_executor(
+                self._db_writer, self.message_storage.store_message, message
+            )
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[%s] %s: %s%s%s",
+                    getattr(message.channel, "name", f"Channel-{message.channel.id}"),
+                    message.author.display_name,
+                    message.content[:LOG_MESSAGE_PREVIEW_LENGTH],
+                    "..." if len(message.content) > LOG_MESSAGE_PREVIEW_LENGTH else "",
+                    f" [{len(message.attachments)} attachment(s)]" if message.attachments else "",
+                )
 
         except Exception as e:
             logger.error(f"Failed to store message: {e}")
 
-    async def _handle_mention(self, message):
+    async def _handle_mention(self, message, channel_id: str):
         """Handle when bot is mentioned - now with AI integration and commands"""
-        channel_id = str(message.channel.id)
-
         # Show typing indicator immediately
         async with message.channel.typing():
+            # Start loading context off the event loop while we check for commands
+            recent_task = asyncio.create_task(
+                asyncio.to_thread(self.message_storage.get_recent_messages, channel_id, MAX_MESSAGE_CONTEXT_FOR_AI)
+            )
+
             # Check for commands first
             parsed_command = self.command_handler.parse_command(message.content)
             if parsed_command:
@@ -153,6 +178,7 @@ class FrankBot(discord.Client):
 
                 command_result = await self.command_handler.handle_command(message, command_name, args)
                 if command_result:
+                    recent_task.cancel()
                     sent_message = await message.channel.send(command_result["response"])
 
                     if "personality_changes" in command_result and self.personality_manager:
@@ -170,7 +196,7 @@ class FrankBot(discord.Client):
 
                     return
 
-            recent_messages = self.message_storage.get_recent_messages(channel_id, MAX_MESSAGE_CONTEXT_FOR_AI)
+            recent_messages = await recent_task
 
             user_personality = None
             if self.personality_manager:
@@ -238,14 +264,39 @@ class FrankBot(discord.Client):
                 logger.error(f"Error in {task_name} scheduler: {e}", exc_info=True)
                 await asyncio.sleep(3600)
 
-    async def _random_reply_scheduler(self):
-        """Background task that executes random replies twice per day (10-14 hour intervals)"""
-        await self._scheduled_task("random reply", self.random_reply.execute_random_reply, 10, 14)
+    def _schedule_random_reply(self):
+        """Arm a timer for the next random reply (twice per day, 10-14 hour intervals)"""
+        hours_until_next = random.uniform(10, 14)
+        logger.info(f"Next random reply scheduled in {hours_until_next:.1f} hours")
+        self.random_reply_handle = asyncio.get_running_loop().call_later(
+            hours_until_next * 3600, self._fire_random_reply
+        )
+
+    def _fire_random_reply(self):
+        """Timer callback that starts the random reply and re-arms the timer once it finishes"""
+        self.random_reply_task = asyncio.create_task(self._run_random_reply())
+
+    async def _run_random_reply(self):
+        try:
+            logger.info("Executing scheduled random reply")
+            await self.random_reply.execute_random_reply()
+        except Exception as e:
+            logger.error(f"Error in random reply scheduler: {e}", exc_info=True)
+
+        self._schedule_random_reply()
 
     async def _channel_cleanup_scheduler(self):
         """Background task that cleans up inaccessible channels once per day"""
         await self._scheduled_task("channel cleanup", self._cleanup_inaccessible_channels, 24, 24)
 
+    async def _db_size_check_scheduler(self):
+        """Background task that checks the database size (and cleans up if needed) off the message path"""
+        interval_hours = DB_SIZE_CHECK_INTERVAL.total_seconds() / 3600
+        await self._scheduled_task("database size check", self._check_database_size, interval_hours, interval_hours)
+
+    async def _check_database_size(self):
+        await asyncio.to_thread(self.message_storage.maybe_cleanup_database_size)
+
     async def _cleanup_inaccessible_channels(self):
         """Clean up channels from database that Frank no longer has access to"""
         try:
@@ -270,6 +321,14 @@ class FrankBot(discord.Client):
         except Exception as e:
             logger.error(f"Error cleaning up inaccessible channels: {e}", exc_info=True)
 
+    async def close(self):
+        await super().close()
+        # Drain queued inserts off the event loop before closing the connections they use
+        await asyncio.to_thread(self._db_writer.shutdown, True)
+        self.message_storage.close()
+        if self.personality_manager:
+            self.personality_manager.close()
+
 
 reconnect_delay = 5
 
@@ -283,6 +342,14 @@ def main():
         logger.error("DISCORD_TOKEN not found in environment")
         return
 
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+    except ImportError:
+        pass
+
     while True:
         try:
             bot = FrankBot()
@@ -13,6 +13,14 @@ class BeHelpfulCommand:
         self.message_storage = message_storage
         self.ai_client = ai_client
         self.personality_manager = personality_manager
+        self._helpful_prompt = ai_client._load_system_prompt("helpful.txt")
+        self._personality_prompt = ai_client._load_system_prompt("personality.txt")
+
+    async def dispatch(self, message, args: list, is_authorized: bool) -> dict[str, Any]:
+        result = await self.execute(message)
+        if isinstance(result, dict):
+            return result
+        return {"response": result}
 
     async def execute(self, message) -> str | dict[str, Any]:
         try:
@@ -35,31 +43,24 @@ class BeHelpfulCommand:
                 user_personality = self.personality_manager.get_user_personality(user_id)
                 if user_personality:
                     point_count = len(user_personality.get("points", []))
-                    logger.info(f"Loaded personality for {message.author.display_name}: {point_count} points")
-
-            original_prompt = self.ai_client.system_prompt
-            original_personality_prompt = self.ai_client.personality_prompt
-            helpful_prompt = self.ai_client._load_system_prompt("helpful.txt")
-
-            self.ai_client.system_prompt = helpful_prompt
-            self.ai_client.personality_prompt = self.ai_client._load_system_prompt("personality.txt")
+                    logger.info("Loaded personality for %s: %d points", message.author.display_name, point_count)
 
-            try:
-                formatted_context, image_urls = self.ai_client._format_context_for_ai(
-                    recent_messages, message.author.display_name, user_personality
-                )
-
-                ai_response = await self.ai_client._generate_conversation_response(formatted_context, image_urls)
+            formatted_context, image_urls = self.ai_client._format_context_for_ai(
+                recent_messages, message.author.display_name, user_personality
+            )
 
-                if ai_response:
-                    clean_response, personality_changes = self.ai_client._parse_personality_changes(ai_response)
-                    return {"response": clean_response, "personality_changes": personality_changes}
-                else:
-                    return f"Hi {message.author.mention}! I'm having trouble generating a response right now."
+            ai_response = await self.ai_client._generate_conversation_response(
+                formatted_context,
+                image_urls,
+                system_prompt=self._helpful_prompt,
+                personality_prompt=self._personality_prompt,
+            )
 
-            finally:
-                self.ai_client.system_prompt = original_prompt
-                self.ai_client.personality_prompt = original_personality_prompt
+            if ai_response:
+                clean_response, personality_changes = self.ai_client._parse_personality_changes(ai_response)
+                return {"response": clean_response, "personality_changes": personality_changes}
+            else:
+                return f"Hi {message.author.mention}! I'm having trouble generating a response right now."
 
         except Exception as e:
             logger.error(f"Error in BeHelpfulCommand: {e}")
@@ -1,9 +1,58 @@
 """Commands command - List available bot commands"""
 
+from typing import Any
+
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+_COMMANDS_INFO = (
+    {
+        "name": "!summarize [count|today|yesterday]",
+        "description": "Frank provides a thoughtful recap of the conversation",
+        "permission": "everyone",
+    },
+    {
+        "name": "!bh (be helpful)",
+        "description": "Larry takes Frank's seat, and he just wants to help you",
+        "permission": "everyone",
+    },
+    {
+        "name": "!roast @user",
+        "description": "Frank digs through someone's message history and serves up a custom roast",
+        "permission": "everyone",
+    },
+    {
+        "name": "!personality [@user]",
+        "description": "Frank shares what he knows about your personality (or someone else's)",
+        "permission": "everyone",
+    },
+    {
+        "name": "!lobotomize [count|all]",
+        "description": "Wipe Frank's memory clean (careful with this one)",
+        "permission": "dan only",
+    },
+)
+
+
+def _build_response(is_authorized: bool) -> str:
+    response_lines = []
+
+    for cmd in _COMMANDS_INFO:
+        if cmd["permission"] == "dan only" and not is_authorized:
+            continue
+
+        response_lines.append(f"**{cmd['name']}**")
+        response_lines.append(f"  • {cmd['description']}")
+        response_lines.append("")
+
+    return "\n".join(response_lines).strip()
+
+
+# The command list is static, so both variants are built once at import
+_AUTHORIZED_RESPONSE = _build_response(True)
+_UNAUTHORIZED_RESPONSE = _build_response(False)
+
 
 class CommandsCommand:
     """Handles the !commands command"""
@@ -12,6 +61,9 @@ class CommandsCommand:
         self.name = "commands"
         self.requires_auth = False
 
+    async def dispatch(self, message, args: list, is_authorized: bool) -> dict[str, Any]:
+        return {"response": self.get_response(is_authorized)}
+
     def get_response(self, is_authorized: bool) -> str:
         """
         Get formatted list of available commands
@@ -22,42 +74,4 @@ class CommandsCommand:
         Returns:
             Formatted string listing all commands
         """
-        commands_info = [
-            {
-                "name": "!summarize [count|today|yesterday]",
-                "description": "Frank provides a thoughtful recap of the conversation",
-                "permission": "everyone",
-            },
-            {
-                "name": "!bh (be helpful)",
-                "description": "Larry takes Frank's seat, and he just wants to help you",
-                "permission": "everyone",
-            },
-            {
-                "name": "!roast @user",
-                "description": "Frank digs through someone's message history and serves up a custom roast",
-                "permission": "everyone",
-            },
-            {
-                "name": "!personality [@user]",
-                "description": "Frank shares what he knows about your personality (or someone else's)",
-                "permission": "everyone",
-            },
-            {
-                "name": "!lobotomize [count|all]",
-                "description": "Wipe Frank's memory clean (careful with this one)",
-                "permission": "dan only",
-            },
-        ]
-
-        response_lines = []
-
-        for cmd in commands_info:
-            if cmd["permission"] == "dan only" and not is_authorized:
-                continue
-
-            response_lines.append(f"**{cmd['name']}**")
-            response_lines.append(f"  • {cmd['description']}")
-            response_lines.append("")
-
-        return "\n".join(response_lines).strip()
+        return _AUTHORIZED_RESPONSE if is_authorized else _UNAUTHORIZED_RESPONSE
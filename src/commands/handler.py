@@ -1,6 +1,7 @@
 """Command system for Frank the Chatter bot"""
 
 import random
+import re
 from typing import Any
 
 from utils.config import Config
@@ -14,6 +15,24 @@ from .summarize import SummarizeCommand
 
 logger = setup_logger(__name__)
 
+# Discord IDs are ints, so compare against the configured ID directly
+_AUTHORIZED_ID = Config.DAN_USER_ID
+
+# First whitespace-delimited token starting with "!" is the command, everything after it is args
+_COMMAND_PATTERN = re.compile(r"(?:^|\s)!(\S*)(.*)", re.DOTALL)
+
+# Dedicated generator for canned responses, independent of the global random state
+_rng = random.Random()
+
+_UNAUTHORIZED_RESPONSES = (
+    "Nice try, but these neurons are off-limits to you.",
+    "Sorry, I only take orders from my one true overlord.",
+    "You don't have the clearance for that, pal.",
+    "LOL no. Only my creator gets to mess with my brain.",
+    "Command rejected. You're not the boss of me.",
+    "Access denied. Did you really think that would work?",
+)
+
 
 class CommandHandler:
     """Handles bot commands that bypass AI responses"""
@@ -41,9 +60,9 @@ class CommandHandler:
         if hasattr(bot, "random_reply"):
             self.commands["random_reply"] = bot.random_reply
 
-    def is_authorized(self, user_id: str) -> bool:
+    def is_authorized(self, user_id: int) -> bool:
         """Check if user is authorized to use commands"""
-        return user_id == str(Config.DAN_USER_ID)
+        return user_id == _AUTHORIZED_ID
 
     def parse_command(self, content: str) -> tuple[str, list] | None:
         """
@@ -53,16 +72,14 @@ class CommandHandler:
         Returns:
             Tuple of (command_name, args) if command found, None otherwise
         """
-        content = content.strip()
-        parts = content.split()
+        if "!" not in content:
+            return None
 
-        for i, part in enumerate(parts):
-            if part.startswith("!"):
-                command_name = part[1:].lower()
-                args = parts[i + 1 :]
-                return (command_name, args)
+        match = _COMMAND_PATTERN.search(content)
+        if not match:
+            return None
 
-        return None
+        return (match.group(1).lower(), match.group(2).split())
 
     async def handle_command(self, message, command_name: str, args: list) -> dict[str, Any] | None:
         """
@@ -71,61 +88,17 @@ class CommandHandler:
         Returns:
             Dict with 'response' and optional metadata, or None if command not found
         """
-        if command_name not in self.commands:
+        command = self.commands.get(command_name)
+        if command is None:
             return None
 
-        command = self.commands[command_name]
-        user_id = str(message.author.id)
-        is_authorized = self.is_authorized(user_id)
+        is_authorized = self.is_authorized(message.author.id)
 
         if command.requires_auth and not is_authorized:
             return {"response": self._get_unauthorized_response()}
 
-        if command_name == "commands":
-            return {"response": command.get_response(is_authorized)}
-
-        if command_name == "summarize":
-            return {"response": await command.execute(message, args)}
-
-        if command_name == "bh":
-            result = await command.execute(message)
-            if isinstance(result, dict):
-                return result
-            else:
-                return {"response": result}
-
-        if command_name == "roast":
-            return {"response": await command.execute(message, args)}
-
-        if command_name == "personality":
-            return {"response": await command.execute(message, args)}
-
-        if command_name == "random_reply":
-            return {"response": await command.execute(message, args)}
-
-        if command_name == "lobotomize":
-            parsed = command.parse_args(args)
-            if "error" in parsed:
-                return {"response": parsed["error"]}
-
-            delete_all = parsed["delete_all"]
-            limit = parsed["limit"]
-
-            return {
-                "response": command.get_processing_response(delete_all),
-                "execute_after_send": lambda msg, sent_msg: command.execute(msg, sent_msg, limit, delete_all),
-            }
-
-        return None
+        return await command.dispatch(message, args, is_authorized)
 
     def _get_unauthorized_response(self) -> str:
         """Get witty response for unauthorized users"""
-        responses = [
-            "Nice try, but these neurons are off-limits to you.",
-            "Sorry, I only take orders from my one true overlord.",
-            "You don't have the clearance for that, pal.",
-            "LOL no. Only my creator gets to mess with my brain.",
-            "Command rejected. You're not the boss of me.",
-            "Access denied. Did you really think that would work?",
-        ]
-        return random.choice(responses)
+        return _rng.choice(_UNAUTHORIZED_RESPONSES)
@@ -8,6 +8,42 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+_rng = random.Random()
+
+_PROCESSING_ALL_RESPONSES = (
+    "💥 INITIATING TOTAL MEMORY WIPE...",
+    "☢️ WARNING: COMPLETE NEURAL PURGE IN PROGRESS...",
+    "🧨 SCORCHED EARTH PROTOCOL ACTIVATED...",
+    "🔥 BURNING IT ALL DOWN...",
+    "🌪️ ERASING EVERYTHING. STAND BY...",
+)
+
+_PROCESSING_RESPONSES = (
+    "⚡ Initiating neural purge...",
+    "🧠 Scrubbing memory banks...",
+    "💭 Forgetting everything...",
+    "🔄 Processing lobotomy request...",
+    "⌛ Erasing recent memories...",
+    "🗑️ Dumping conversation history...",
+)
+
+# Completion templates are formatted with the deleted message count
+_COMPLETION_ALL_RESPONSES = (
+    "💥 Complete memory wipe. All {count} messages obliterated. Who are you again?",
+    "🧨 Total neural reset. {count} messages erased. This channel never happened.",
+    "☢️ Full lobotomy complete. {count} messages gone forever. I'm basically brand new.",
+    "🔥 Everything burned. {count} messages reduced to ash. Fresh start!",
+    "🌪️ Scorched earth protocol executed. {count} messages swept away. Clean slate achieved.",
+)
+
+_COMPLETION_RESPONSES = (
+    "*blanks out* ...wait, what were we talking about? ({count} messages yeeted from my brain)",
+    "Memory wiped. The last {count} messages? Never heard of 'em.",
+    "Lobotomy complete. {count} messages vanished into the void. I feel... lighter?",
+    "Done. {count} messages scrubbed from my neural pathways. Feels weird.",
+    "*BZZT* Memory banks cleared. {count} messages? What messages?",
+)
+
 
 class LobotomizeCommand:
     """Handles the !lobotomize command"""
@@ -24,62 +60,45 @@ class LobotomizeCommand:
         Returns:
             Dict with 'delete_all' (bool) and 'limit' (Optional[int])
         """
-        delete_all = False
-        limit = None
+        if not args:
+            return {"delete_all": False, "limit": None}
 
-        if args:
+        # Numeric counts are the common case, so try them before checking for "all"
+        try:
+            limit = int(args[0])
+        except ValueError:
             if args[0].lower() == "all":
-                delete_all = True
-            else:
-                try:
-                    limit = int(args[0])
-                    if limit <= 0:
-                        return {"error": "Nice try, but I need a positive number of messages to forget."}
-                except ValueError:
-                    return {"error": f"'{args[0]}' isn't a number. Use a number or 'all' to wipe everything."}
+                return {"delete_all": True, "limit": None}
+            return {"error": f"'{args[0]}' isn't a number. Use a number or 'all' to wipe everything."}
+
+        if limit <= 0:
+            return {"error": "Nice try, but I need a positive number of messages to forget."}
+
+        return {"delete_all": False, "limit": limit}
+
+    async def dispatch(self, message, args: list, is_authorized: bool) -> dict[str, Any]:
+        """Reply with a processing message now and run the deletion once it has been sent"""
+        parsed = self.parse_args(args)
+        if "error" in parsed:
+            return {"response": parsed["error"]}
+
+        delete_all = parsed["delete_all"]
+        limit = parsed["limit"]
 
-        return {"delete_all": delete_all, "limit": limit}
+        return {
+            "response": self.get_processing_response(delete_all),
+            "execute_after_send": lambda msg, sent_msg: self.execute(msg, sent_msg, limit, delete_all),
+        }
 
     def get_processing_response(self, delete_all: bool = False) -> str:
         """Get a random processing message (shown before deletion)"""
-        if delete_all:
-            responses = [
-                "💥 INITIATING TOTAL MEMORY WIPE...",
-                "☢️ WARNING: COMPLETE NEURAL PURGE IN PROGRESS...",
-                "🧨 SCORCHED EARTH PROTOCOL ACTIVATED...",
-                "🔥 BURNING IT ALL DOWN...",
-                "🌪️ ERASING EVERYTHING. STAND BY...",
-            ]
-        else:
-            responses = [
-                "⚡ Initiating neural purge...",
-                "🧠 Scrubbing memory banks...",
-                "💭 Forgetting everything...",
-                "🔄 Processing lobotomy request...",
-                "⌛ Erasing recent memories...",
-                "🗑️ Dumping conversation history...",
-            ]
-        return random.choice(responses)
+        responses = _PROCESSING_ALL_RESPONSES if delete_all else _PROCESSING_RESPONSES
+        return _rng.choice(responses)
 
     def get_completion_response(self, count: int, delete_all: bool = False) -> str:
         """Get a random completion message with count"""
-        if delete_all:
-            responses = [
-                f"💥 Complete memory wipe. All {count} messages obliterated. Who are you again?",
-                f"🧨 Total neural reset. {count} messages erased. This channel never happened.",
-                f"☢️ Full lobotomy complete. {count} messages gone forever. I'm basically brand new.",
-                f"🔥 Everything burned. {count} messages reduced to ash. Fresh start!",
-                f"🌪️ Scorched earth protocol executed. {count} messages swept away. Clean slate achieved.",
-            ]
-        else:
-            responses = [
-                f"*blanks out* ...wait, what were we talking about? ({count} messages yeeted from my brain)",
-                f"Memory wiped. The last {count} messages? Never heard of 'em.",
-                f"Lobotomy complete. {count} messages vanished into the void. I feel... lighter?",
-                f"Done. {count} messages scrubbed from my neural pathways. Feels weird.",
-                f"*BZZT* Memory banks cleared. {count} messages? What messages?",
-            ]
-        return random.choice(responses)
+        responses = _COMPLETION_ALL_RESPONSES if delete_all else _COMPLETION_RESPONSES
+        return _rng.choice(responses).format(count=count)
 
     async def execute(
         self,
@@ -103,12 +122,12 @@ class LobotomizeCommand:
         try:
             if delete_all:
                 deleted_count = self.message_storage.delete_all_channel_messages(channel_id)
-                logger.info(f"Lobotomize ALL: deleted {deleted_count} messages and cleared conversation record")
+                logger.info("Lobotomize ALL: deleted %d messages and cleared conversation record", deleted_count)
             else:
                 limit = limit if limit is not None else MAX_MESSAGE_CONTEXT_FOR_AI
                 limit += 2
                 deleted_count = self.message_storage.delete_recent_messages(channel_id, limit)
-                logger.info(f"Lobotomize: deleted {deleted_count} messages including command and response")
+                logger.info("Lobotomize: deleted %d messages including command and response", deleted_count)
 
             if deleted_count > 0:
                 response = self.get_completion_response(deleted_count, delete_all)
@@ -1,5 +1,8 @@
-from utils.config import PROMPT_DIR, Config
+from typing import Any
+
+from utils.config import Config
 from utils.logger import setup_logger
+from utils.prompts import load_prompt
 
 logger = setup_logger(__name__)
 
@@ -10,6 +13,10 @@ class PersonalityCommand:
         self.requires_auth = False
         self.personality_manager = personality_manager
         self.ai_client = ai_client
+        self._personality_prompt = self._get_personality_prompt()
+
+    async def dispatch(self, message, args: list, is_authorized: bool) -> dict[str, Any]:
+        return {"response": await self.execute(message, args)}
 
     async def execute(self, message, args) -> str:
         try:
@@ -49,7 +56,7 @@ class PersonalityCommand:
             formatted_points = self.personality_manager.format_personality_for_prompt(personality)
             return f"My AI is unavailable, but here's what I know about {target_user.display_name}:{formatted_points}"
 
-        personality_prompt = self._get_personality_prompt()
+        personality_prompt = self._personality_prompt
 
         points = personality["points"]
         context_parts = [
@@ -81,5 +88,11 @@ class PersonalityCommand:
             return f"{fallback}{formatted_points}"
 
     def _get_personality_prompt(self):
-        prompt_path = PROMPT_DIR / "personality_command.txt"
-        return prompt_path.read_text().strip()
+        try:
+            return load_prompt("personality_command.txt")
+        except Exception as e:
+            logger.error(f"Error loading personality command prompt: {e}")
+            return (
+                "You are Frank, a witty AI. Summarize what you know about this user's personality "
+                "based on the points provided."
+            )
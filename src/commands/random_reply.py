@@ -1,13 +1,20 @@
 import re
+from typing import Any
 
 import discord
 
-from utils.config import PROMPT_DIR, Config
-from utils.constants import AI_RANDOM_REPLY_MAX_TOKENS, MAX_MESSAGE_CONTEXT_FOR_AI
+from utils.config import Config
+from utils.constants import MAX_MESSAGE_CONTEXT_FOR_AI
 from utils.logger import setup_logger
+from utils.prompts import load_prompt
 
 logger = setup_logger(__name__)
 
+# Bounded ID and same-line whitespace keep the match linear on malformed AI output
+_REPLY_PATTERN = re.compile(r"REPLY_TO:\s*(\d{1,20})\s*\n(.*)", re.DOTALL)
+# Config IDs are fixed at import, so the bot and Dan are always the users to skip
+_EXCLUDE_USER_IDS = [str(Config.BOT_USER_ID), str(Config.DAN_USER_ID)]
+
 
 class RandomReply:
     def __init__(self, bot, message_storage, ai_client):
@@ -18,6 +25,9 @@ class RandomReply:
         self.ai_client = ai_client
         self.prompt = self._load_prompt()
 
+    async def dispatch(self, message, args: list, is_authorized: bool) -> dict[str, Any]:
+        return {"response": await self.execute(message, args)}
+
     async def execute(self, _message, _args) -> str:
         try:
             await self.execute_random_reply()
@@ -29,12 +39,7 @@ class RandomReply:
         try:
             logger.info("Starting random reply execution")
 
-            exclude_user_ids = [
-                str(Config.BOT_USER_ID),
-                str(Config.DAN_USER_ID),
-            ]
-
-            random_user = self.message_storage.db.get_random_user(exclude_user_ids)
+            random_user = self.message_storage.db.get_random_user(_EXCLUDE_USER_IDS)
 
             if not random_user:
                 logger.warning("No eligible users found for random reply")
@@ -73,14 +78,19 @@ class RandomReply:
                 logger.error(f"Could not find channel {channel_id}")
                 return
 
-            try:
-                target_message = await channel.fetch_message(int(target_message_id))
-            except discord.NotFound:
-                logger.error(f"Message {target_message_id} not found in channel")
-                return
-            except discord.Forbidden:
-                logger.error(f"No permission to fetch message {target_message_id}")
-                return
+            target_message_int_id = int(target_message_id)
+
+            # Recent messages are usually still in the client cache, which saves a REST round-trip
+            target_message = discord.utils.get(self.bot.cached_messages, id=target_message_int_id)
+            if target_message is None:
+                try:
+                    target_message = await channel.fetch_message(target_message_int_id)
+                except discord.NotFound:
+                    logger.error(f"Message {target_message_id} not found in channel")
+                    return
+                except discord.Forbidden:
+                    logger.error(f"No permission to fetch message {target_message_id}")
+                    return
 
             await target_message.reply(reply_text)
             logger.info(f"Successfully replied to message {target_message_id} from {username}")
@@ -88,32 +98,15 @@ class RandomReply:
         except Exception as e:
             logger.error(f"Error in random reply execution: {e}", exc_info=True)
 
-    async def _generate_reply_with_selection(self, username: str, messages: list[dict]) -> str | None:
+    async def _generate_reply_with_selection(self, username: str, messages: list[tuple[str, str]]) -> str | None:
         try:
-            if not self.ai_client.is_available():
-                logger.error("AI client is not available")
-                return None
-
-            prompt = self.prompt
-
-            context_parts = [f"Messages from {username}:\n"]
-            for msg in messages:
-                message_id = msg["discord_message_id"]
-                content = msg["content"]
-                context_parts.append(f"[ID: {message_id}] {username}: {content}")
-
-            formatted_context = "\n".join(context_parts)
-
-            ai_response = await self.ai_client._generate_with_config(
-                formatted_context=formatted_context,
-                system_prompt=prompt,
-                image_urls=None,
-                enable_tools=False,
-                temperature=1.0,
-                max_tokens=AI_RANDOM_REPLY_MAX_TOKENS,
+            # Every line is from the same user, so format the shared "] username: " part once
+            user_separator = f"] {username}: "
+            formatted_context = f"Messages from {username}:\n\n" + "\n".join(
+                f"[ID: {message_id}{user_separator}{content}" for message_id, content in messages
             )
 
-            return ai_response
+            return await self.ai_client.generate_selection_response(formatted_context, self.prompt)
 
         except Exception as e:
             logger.error(f"Error generating reply: {e}")
@@ -121,15 +114,13 @@ class RandomReply:
 
     def _load_prompt(self) -> str:
         try:
-            prompt_path = PROMPT_DIR / "random_reply.txt"
-            if prompt_path.exists():
-                return prompt_path.read_text().strip()
-            else:
-                logger.warning("random_reply.txt not found, using default prompt")
-                return (
-                    "You are Frank, a witty AI. Select the most interesting message and reply to it. "
-                    "Format: REPLY_TO: [message_id]\\n[your response]"
-                )
+            return load_prompt("random_reply.txt")
+        except FileNotFoundError:
+            logger.warning("random_reply.txt not found, using default prompt")
+            return (
+                "You are Frank, a witty AI. Select the most interesting message and reply to it. "
+                "Format: REPLY_TO: [message_id]\\n[your response]"
+            )
         except Exception as e:
             logger.error(f"Error loading random reply prompt: {e}")
             return (
@@ -138,7 +129,10 @@ class RandomReply:
             )
 
     def _parse_ai_response(self, response: str) -> tuple[str | None, str | None]:
-        match = re.match(r"REPLY_TO:\s*(\d+)\s*\n(.*)", response, re.DOTALL)
+        if not response.startswith("REPLY_TO:"):
+            return None, None
+
+        match = _REPLY_PATTERN.match(response)
         if match:
             message_id = match.group(1).strip()
             reply_text = match.group(2).strip()
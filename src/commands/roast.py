@@ -1,8 +1,12 @@
+import heapq
+from typing import Any
+
 import discord
 
-from utils.config import PROMPT_DIR, Config
+from utils.config import Config
 from utils.constants import MAX_MESSAGE_CONTEXT_FOR_AI
 from utils.logger import setup_logger
+from utils.prompts import load_prompt
 
 logger = setup_logger(__name__)
 
@@ -14,6 +18,9 @@ class RoastCommand:
         self.message_storage = message_storage
         self.ai_client = ai_client
 
+    async def dispatch(self, message, args: list, is_authorized: bool) -> dict[str, Any]:
+        return {"response": await self.execute(message, args)}
+
     async def execute(self, message, args) -> str:
         try:
             if not args:
@@ -39,7 +46,7 @@ class RoastCommand:
             if len(messages) < 3:
                 return f"I need more material to work with. {target_user.display_name} has barely said anything."
 
-            roast = await self._generate_roast(target_user, messages)
+            roast = await self._generate_roast(target_user, messages, self._get_roast_prompt(target_user))
             return roast
 
         except discord.Forbidden:
@@ -62,29 +69,30 @@ class RoastCommand:
         try:
             search_context = message.guild if message.guild else message.channel
 
-            messages = []
-            async for msg in search_context.search(authors=[target_user], limit=MAX_MESSAGE_CONTEXT_FOR_AI):
-                if msg.author.id == target_user.id and msg.content.strip():
-                    messages.append(msg)
+            messages = [
+                msg
+                async for msg in search_context.search(authors=[target_user], limit=MAX_MESSAGE_CONTEXT_FOR_AI)
+                if msg.author.id == target_user.id and msg.content.strip()
+            ]
 
-            messages.sort(key=lambda m: m.created_at, reverse=True)
-            return messages[:MAX_MESSAGE_CONTEXT_FOR_AI]
+            # Keep the newest messages, returned oldest first for the roast context
+            newest = heapq.nlargest(MAX_MESSAGE_CONTEXT_FOR_AI, messages, key=lambda m: m.created_at)
+            newest.reverse()
+            return newest
 
         except Exception as e:
             logger.error(f"Error searching messages: {e}")
             return []
 
-    async def _generate_roast(self, target_user, messages):
+    async def _generate_roast(self, target_user, messages, roast_prompt):
         try:
             if not self.ai_client.is_available():
                 return (
                     f"My AI is unavailable right now, but I'm sure {target_user.display_name} deserves a good roasting."
                 )
 
-            roast_prompt = self._get_roast_prompt(target_user)
-
             context_parts = [f"Messages from {target_user.display_name} to analyze:\n"]
-            for msg in reversed(messages):
+            for msg in messages:
                 context_parts.append(f"{target_user.display_name}: {msg.content}")
 
             context_parts.append(
@@ -119,17 +127,14 @@ class RoastCommand:
 
     def _get_roast_prompt(self, target_user):
         try:
-            if target_user.id == Config.DAN_USER_ID:
-                prompt_path = PROMPT_DIR / "roast_dan.txt"
-            else:
-                prompt_path = PROMPT_DIR / "roast.txt"
+            prompt_file = "roast_dan.txt" if target_user.id == Config.DAN_USER_ID else "roast.txt"
 
-            prompt = prompt_path.read_text().strip()
-            return prompt.replace("{username}", target_user.display_name)
+            # Keep the system prompt identical across targets so Gemini can reuse its cached prefix;
+            # the target's name is already in the user context
+            return load_prompt(prompt_file)
         except Exception as e:
             logger.error(f"Error loading roast prompt: {e}")
             return (
-                "You are a witty AI roaster. Generate a clever, playful roast of "
-                f"{target_user.display_name} based on their message history. "
-                "Keep it fun and not genuinely mean."
+                "You are a witty AI roaster. Generate a clever, playful roast of the user "
+                "based on their message history. Keep it fun and not genuinely mean."
             )
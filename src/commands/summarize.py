@@ -19,6 +19,10 @@ class SummarizeCommand:
         if not args:
             return {"type": "today", "value": None}
 
+        # Plain counts skip the lowercasing and the ValueError path
+        if args[0].isdecimal():
+            return self._parse_count(int(args[0]))
+
         arg = args[0].lower()
 
         if arg == "today":
@@ -27,18 +31,23 @@ class SummarizeCommand:
             return {"type": "yesterday", "value": None}
         else:
             try:
-                count = int(arg)
-                if count <= 0:
-                    return {"type": "error", "error": "Please provide a valid positive number."}
-                if count > self.max_count:
-                    return {"type": "error", "error": f"Maximum {self.max_count} messages. You requested {count}."}
-                return {"type": "count", "value": count}
+                return self._parse_count(int(arg))
             except ValueError:
                 return {
                     "type": "error",
                     "error": (f"Invalid argument '{arg}'. Usage: !summarize " "[count|today|yesterday]"),
                 }
 
+    def _parse_count(self, count: int) -> dict[str, Any]:
+        if count <= 0:
+            return {"type": "error", "error": "Please provide a valid positive number."}
+        if count > self.max_count:
+            return {"type": "error", "error": f"Maximum {self.max_count} messages. You requested {count}."}
+        return {"type": "count", "value": count}
+
+    async def dispatch(self, message, args: list, is_authorized: bool) -> dict[str, Any]:
+        return {"response": await self.execute(message, args)}
+
     async def execute(self, message, args: list) -> str:
         try:
             parsed = self.parse_args(args)
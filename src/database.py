@@ -1,8 +1,11 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 import json
-import os
 from pathlib import Path
+import random
 import sqlite3
+import threading
 from typing import Any
 
 from utils.constants import (
@@ -14,22 +17,82 @@ from utils.constants import (
     MAX_DATABASE_SIZE_GB,
     MAX_MESSAGES_PER_CHANNEL,
     MB_PER_GB,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_INCREMENTAL_VACUUM_PAGES,
+    SQLITE_MMAP_SIZE_BYTES,
 )
 
+# Explicit stand-in for sqlite3's default datetime adapter (deprecated since Python 3.12), same text format
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+
 
 class MessageDatabase:
-    def __init__(self, db_path: str = "data/conversations.db"):
+    def __init__(self, db_path: str | Path = "data/conversations.db"):
         self.db_path = db_path
         self._ensure_data_dir()
+        # One writer connection for the life of the process; the lock serializes writes across threads
+        self._conn = self._connect()
+        self._lock = threading.Lock()
+        # Reads use a connection per thread so WAL lets them run alongside the writer instead of queueing on the lock
+        self._local = threading.local()
+        self._reader_conns: list[sqlite3.Connection] = []
         self._init_database()
 
     def _ensure_data_dir(self):
         """Create data directory if it doesn't exist"""
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the per-connection performance PRAGMAs applied"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE_BYTES}")
+        conn.execute(f"PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KB}")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Hold the shared connection for one transaction, committing on success and rolling back on error"""
+        with self._lock, self._conn:
+            # Methods that want sqlite3.Row rows opt in per call
+            self._conn.row_factory = None
+            yield self._conn
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Yield this thread's read connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            with self._lock:
+                self._reader_conns.append(conn)
+        # Methods that want sqlite3.Row rows opt in per call
+        conn.row_factory = None
+        yield conn
+
+    def close(self):
+        """Close the writer connection and every per-thread read connection"""
+        with self._lock:
+            self._conn.close()
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
+
     def _init_database(self):
         """Initialize database tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
+            # WAL is persistent in the database file: readers no longer block on writers and
+            # commits skip the rollback-journal fsync, so it only has to be set once here
+            conn.execute("PRAGMA journal_mode = WAL")
+
+            # Incremental auto-vacuum lets maintenance hand freed pages back in bounded steps instead of a full
+            # VACUUM that holds the writer for the whole file rewrite. The mode only takes effect through a
+            # VACUUM, so an existing file is converted once here, before the bot starts serving
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS messages (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -39,47 +102,93 @@ class MessageDatabase:
                     username TEXT NOT NULL,
                     content TEXT,
                     timestamp DATETIME NOT NULL,
-                    has_attachments BOOLEAN DEFAULT FALSE,
                     media_files TEXT,  -- JSON array of file info
+                    has_attachments BOOLEAN GENERATED ALWAYS AS (media_files IS NOT NULL) VIRTUAL,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
                     interacts_with_bot BOOLEAN DEFAULT FALSE
                 )
             """)
 
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS conversations (
-                    id INTEGER PRIMARY KEY,
-                    channel_id TEXT UNIQUE,
+            # Both tables are only ever looked up by their natural key, so store them keyed on it directly
+            self._create_without_rowid_table(
+                conn,
+                "conversations",
+                """
+                CREATE TABLE {table} (
+                    channel_id TEXT PRIMARY KEY,
                     channel_name TEXT,
                     last_activity DATETIME,
                     message_count INTEGER,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+                ) WITHOUT ROWID
+            """,
+                "channel_id, channel_name, last_activity, message_count, created_at",
+            )
 
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS user_personalities (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT NOT NULL,
+            self._create_without_rowid_table(
+                conn,
+                "user_personalities",
+                """
+                CREATE TABLE {table} (
+                    user_id TEXT PRIMARY KEY,
                     username TEXT NOT NULL,
                     points TEXT NOT NULL,
                     last_updated DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(user_id)
-                )
-            """)
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                ) WITHOUT ROWID
+            """,
+                "user_id, username, points, last_updated, created_at",
+            )
 
             # Create indexes for fast queries
             conn.execute("CREATE INDEX IF NOT EXISTS idx_channel_timestamp ON messages(channel_id, timestamp DESC)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_discord_message_id ON messages(discord_message_id)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_user_personalities_user_id ON user_personalities(user_id)")
 
             # Add new column to existing tables if it doesn't exist
-            cursor = conn.execute("PRAGMA table_info(messages)")
-            columns = [row[1] for row in cursor.fetchall()]
+            cursor = conn.execute("PRAGMA table_xinfo(messages)")
+            columns = {row[1]: row[6] for row in cursor.fetchall()}  # column name -> hidden (2 = virtual)
             if "interacts_with_bot" not in columns:
                 conn.execute("ALTER TABLE messages ADD COLUMN interacts_with_bot BOOLEAN DEFAULT FALSE")
 
+            # has_attachments used to be stored alongside media_files; it is now derived from it. Also repair a
+            # missing column, and drop and re-add inside one explicit transaction, as DDL does not open one itself
+            has_attachments_hidden = columns.get("has_attachments")
+            if has_attachments_hidden != 2:
+                conn.execute("BEGIN")
+                if has_attachments_hidden is not None:
+                    conn.execute("ALTER TABLE messages DROP COLUMN has_attachments")
+                conn.execute(
+                    "ALTER TABLE messages ADD COLUMN has_attachments BOOLEAN "
+                    "GENERATED ALWAYS AS (media_files IS NOT NULL) VIRTUAL"
+                )
+                conn.commit()
+
+            # Random reply lookups: one user's messages in a channel, and the per-user/channel grouping
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_user_channel_bot_ts "
+                "ON messages(user_id, channel_id, interacts_with_bot, timestamp DESC)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_user_channel_no_bot "
+                "ON messages(user_id, channel_id) WHERE interacts_with_bot = 0"
+            )
+
+            conn.commit()
+
+    @staticmethod
+    def _create_without_rowid_table(conn: sqlite3.Connection, table: str, create_sql: str, columns: str):
+        """Create a WITHOUT ROWID table, rebuilding an older rowid version of it in place"""
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+        if row is None:
+            conn.execute(create_sql.format(table=table))
+        elif "WITHOUT ROWID" not in row[0].upper():
+            # DDL does not open a transaction implicitly, so begin one to make the rebuild all-or-nothing
+            conn.execute("BEGIN")
+            conn.execute(f"DROP TABLE IF EXISTS {table}_new")
+            conn.execute(create_sql.format(table=f"{table}_new"))
+            conn.execute(f"INSERT INTO {table}_new ({columns}) SELECT {columns} FROM {table}")
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
             conn.commit()
 
     def store_message(
@@ -109,16 +218,16 @@ class MessageDatabase:
         Returns:
             Message ID from database
         """
-        has_attachments = bool(attachments)
         media_files_json = json.dumps(attachments) if attachments else None
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.execute(
                 """
                 INSERT INTO messages
                 (channel_id, discord_message_id, user_id, username, content,
-                 timestamp, has_attachments, media_files, interacts_with_bot)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 timestamp, media_files, interacts_with_bot)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                RETURNING id
             """,
                 (
                     channel_id,
@@ -127,30 +236,77 @@ class MessageDatabase:
                     username,
                     content,
                     timestamp,
-                    has_attachments,
                     media_files_json,
                     interacts_with_bot,
                 ),
             )
 
-            message_id = cursor.lastrowid
-            if message_id is None:
+            row = cursor.fetchone()
+            if row is None:
                 raise ValueError("Failed to store message")
+            message_id = row[0]
 
             conn.execute(
                 """
                 INSERT INTO conversations (channel_id, last_activity, message_count)
                 VALUES (?, ?, 1)
                 ON CONFLICT(channel_id) DO UPDATE SET
-                    last_activity = ?,
-                    message_count = (SELECT COUNT(*) FROM messages WHERE channel_id = ?)
+                    last_activity = excluded.last_activity,
+                    message_count = conversations.message_count + 1
                 """,
-                (channel_id, timestamp, timestamp, channel_id),
+                (channel_id, timestamp),
             )
 
             conn.commit()
             return message_id
 
+    def store_messages(self, messages: list[tuple]) -> int:
+        """
+        Store many Discord messages in a single transaction (e.g. when backfilling channel history)
+
+        Messages already in the database are skipped, and conversation stats are
+        refreshed once per channel instead of once per message.
+
+        Args:
+            messages: Tuples of (channel_id, discord_message_id, user_id, username, content,
+                timestamp, attachments, interacts_with_bot), matching store_message's arguments
+
+        Returns:
+            Number of messages inserted
+        """
+        rows = [
+            (*columns, json.dumps(attachments) if attachments else None, interacts_with_bot)
+            for *columns, attachments, interacts_with_bot in messages
+        ]
+        if not rows:
+            return 0
+
+        with self._connection() as conn:
+            changes_before = conn.total_changes
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO messages
+                (channel_id, discord_message_id, user_id, username, content,
+                 timestamp, media_files, interacts_with_bot)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                rows,
+            )
+            inserted = conn.total_changes - changes_before
+
+            conn.executemany(
+                """
+                INSERT INTO conversations (channel_id, last_activity, message_count)
+                SELECT channel_id, MAX(timestamp), COUNT(*) FROM messages WHERE channel_id = ? GROUP BY channel_id
+                ON CONFLICT(channel_id) DO UPDATE SET
+                    last_activity = excluded.last_activity,
+                    message_count = excluded.message_count
+                """,
+                [(channel_id,) for channel_id in {row[0] for row in rows}],
+            )
+
+            return inserted
+
     def get_recent_messages(self, channel_id: str, limit: int = DEFAULT_RECENT_MESSAGES) -> list[dict[str, Any]]:
         """
         Get recent messages from a channel for AI context
@@ -162,32 +318,33 @@ class MessageDatabase:
         Returns:
             List of message dictionaries
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._reader() as conn:
             cursor = conn.execute(
                 """
                 SELECT username, content, timestamp, has_attachments, media_files
-                FROM messages
-                WHERE channel_id = ?
-                ORDER BY timestamp DESC
-                LIMIT ?
+                FROM (
+                    SELECT username, content, timestamp, has_attachments, media_files
+                    FROM messages
+                    WHERE channel_id = ?
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                )
+                ORDER BY timestamp ASC
             """,
                 (channel_id, limit),
             )
 
-            messages = []
-            for row in cursor.fetchall():
-                message = {
-                    "username": row["username"],
-                    "content": row["content"],
-                    "timestamp": row["timestamp"],
-                    "has_attachments": bool(row["has_attachments"]),
-                    "media_files": json.loads(row["media_files"]) if row["media_files"] else [],
+            # Rows arrive in chronological order (oldest first)
+            return [
+                {
+                    "username": username,
+                    "content": content,
+                    "timestamp": timestamp,
+                    "has_attachments": bool(has_attachments),
+                    "media_files": json.loads(media_files) if media_files else [],
                 }
-                messages.append(message)
-
-            # Return in chronological order (oldest first)
-            return list(reversed(messages))
+                for username, content, timestamp, has_attachments, media_files in cursor
+            ]
 
     def delete_all_channel_messages(self, channel_id: str) -> int:
         """
@@ -199,7 +356,7 @@ class MessageDatabase:
         Returns:
             Number of messages deleted
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.execute("DELETE FROM messages WHERE channel_id = ?", (channel_id,))
             deleted_messages = cursor.rowcount
 
@@ -219,122 +376,116 @@ class MessageDatabase:
         Returns:
             Number of messages deleted
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.execute(
                 """
-                SELECT id FROM messages
-                WHERE channel_id = ?
-                ORDER BY timestamp DESC
-                LIMIT ?
+                DELETE FROM messages
+                WHERE id IN (
+                    SELECT id FROM messages
+                    WHERE channel_id = ?
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                )
             """,
                 (channel_id, limit),
             )
 
-            message_ids = [row[0] for row in cursor.fetchall()]
+            deleted_count = cursor.rowcount
 
-            if message_ids:
-                placeholders = ",".join("?" * len(message_ids))
+            if deleted_count:
                 conn.execute(
-                    f"""
-                    DELETE FROM messages
-                    WHERE id IN ({placeholders})
-                """,
-                    message_ids,
-                )
-
-                cursor = conn.execute(
                     """
                     UPDATE conversations
-                    SET message_count = (
-                        SELECT COUNT(*) FROM messages WHERE channel_id = ?
-                    ),
-                    last_activity = (
-                        SELECT MAX(timestamp) FROM messages WHERE channel_id = ?
+                    SET (message_count, last_activity) = (
+                        SELECT COUNT(*), MAX(timestamp) FROM messages WHERE channel_id = ?
                     )
                     WHERE channel_id = ?
                 """,
-                    (channel_id, channel_id, channel_id),
+                    (channel_id, channel_id),
                 )
 
                 conn.commit()
-                return len(message_ids)
+                return deleted_count
 
             return 0
 
     def cleanup_old_messages(self, channel_id: str, keep_last: int = MAX_MESSAGES_PER_CHANNEL):
-        with sqlite3.connect(self.db_path) as conn:
-            # Find messages to delete (older than the last N messages)
+        with self._connection() as conn:
+            # Delete messages older than the last N (media URLs are stored as JSON in messages table)
             cursor = conn.execute(
                 """
-                SELECT id FROM messages
-                WHERE channel_id = ?
-                ORDER BY timestamp DESC
-                LIMIT -1 OFFSET ?
+                DELETE FROM messages
+                WHERE id IN (
+                    SELECT id FROM messages
+                    WHERE channel_id = ?
+                    ORDER BY timestamp DESC
+                    LIMIT -1 OFFSET ?
+                )
             """,
                 (channel_id, keep_last),
             )
 
-            old_message_ids = [row[0] for row in cursor.fetchall()]
-
-            if old_message_ids:
-                # Delete old messages (media URLs are stored as JSON in messages table)
-                placeholders = ",".join("?" * len(old_message_ids))
-                conn.execute(
-                    f"""
-                    DELETE FROM messages
-                    WHERE id IN ({placeholders})
-                """,
-                    old_message_ids,
-                )
+            deleted_count = cursor.rowcount
 
+            if deleted_count:
                 conn.execute(
                     """
                     UPDATE conversations
-                    SET message_count = (
-                        SELECT COUNT(*) FROM messages WHERE channel_id = ?
-                    ),
-                    last_activity = (
-                        SELECT MAX(timestamp) FROM messages WHERE channel_id = ?
+                    SET (message_count, last_activity) = (
+                        SELECT COUNT(*), MAX(timestamp) FROM messages WHERE channel_id = ?
                     )
                     WHERE channel_id = ?
                 """,
-                    (channel_id, channel_id, channel_id),
+                    (channel_id, channel_id),
                 )
 
                 conn.commit()
-                print(f"Cleaned up {len(old_message_ids)} old messages from channel {channel_id}")
+                print(f"Cleaned up {deleted_count} old messages from channel {channel_id}")
 
     def get_message_count(self, channel_id: str) -> int:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM messages WHERE channel_id = ?", (channel_id,))
-            return cursor.fetchone()[0]
+        with self._reader() as conn:
+            # conversations.message_count is kept in step by every insert and delete path
+            cursor = conn.execute("SELECT message_count FROM conversations WHERE channel_id = ?", (channel_id,))
+            row = cursor.fetchone()
+            return row[0] if row else 0
 
     def get_channels_with_messages(self) -> list[dict[str, Any]]:
         """Get list of all channels with message counts"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._reader() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute("""
-                SELECT channel_id, COUNT(*) as message_count,
-                       MAX(timestamp) as last_activity
-                FROM messages
-                GROUP BY channel_id
+                SELECT channel_id, message_count, last_activity
+                FROM conversations
+                WHERE message_count > 0
                 ORDER BY last_activity DESC
             """)
 
             return [dict(row) for row in cursor.fetchall()]
 
     def get_database_size_mb(self) -> float:
-        """Get current database file size in MB"""
-        try:
-            size_bytes = os.path.getsize(self.db_path)
-            return size_bytes / BYTES_PER_MB
-        except FileNotFoundError:
-            return 0.0
+        """Get current database size in MB, including pages still in the WAL"""
+        with self._reader() as conn:
+            cursor = conn.execute("SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()")
+            return cursor.fetchone()[0] / BYTES_PER_MB
+
+    def _get_live_size_mb(self) -> float:
+        """Get the size of the pages still holding data in MB"""
+        with self._reader() as conn:
+            return self._live_size_mb(conn)
+
+    @staticmethod
+    def _live_size_mb(conn: sqlite3.Connection) -> float:
+        """Size of the pages still holding data, i.e. what the file would shrink to after a VACUUM"""
+        cursor = conn.execute(
+            "SELECT (page_count - freelist_count) * page_size "
+            "FROM pragma_page_count(), pragma_freelist_count(), pragma_page_size()"
+        )
+        return cursor.fetchone()[0] / BYTES_PER_MB
 
     def get_total_message_count(self) -> int:
         """Get total number of messages across all channels"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM messages")
+        with self._reader() as conn:
+            cursor = conn.execute("SELECT COALESCE(SUM(message_count), 0) FROM conversations")
             return cursor.fetchone()[0]
 
     def cleanup_old_messages_by_age(self, days_to_keep: int = 30):
@@ -346,7 +497,7 @@ class MessageDatabase:
         """
         cutoff_date = datetime.now() - timedelta(days=days_to_keep)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.execute(
                 """
                 DELETE FROM messages
@@ -360,14 +511,10 @@ class MessageDatabase:
             if deleted_count > 0:
                 conn.execute("""
                     UPDATE conversations
-                    SET message_count = (
-                        SELECT COUNT(*) FROM messages WHERE messages.channel_id = conversations.channel_id
-                    ),
-                    last_activity = (
-                        SELECT MAX(timestamp) FROM messages WHERE messages.channel_id = conversations.channel_id
-                    )
-                    WHERE channel_id IN (
-                        SELECT DISTINCT channel_id FROM messages
+                    SET (message_count, last_activity) = (
+                        SELECT COUNT(*), MAX(timestamp)
+                        FROM messages
+                        WHERE messages.channel_id = conversations.channel_id
                     )
                 """)
 
@@ -392,8 +539,7 @@ class MessageDatabase:
         Returns:
             List of message dictionaries in chronological order
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._reader() as conn:
             cursor = conn.execute(
                 """
                 SELECT username, content, timestamp, has_attachments, media_files
@@ -404,18 +550,16 @@ class MessageDatabase:
                 (channel_id, start_date, end_date),
             )
 
-            messages = []
-            for row in cursor.fetchall():
-                message = {
-                    "username": row["username"],
-                    "content": row["content"],
-                    "timestamp": row["timestamp"],
-                    "has_attachments": bool(row["has_attachments"]),
-                    "media_files": json.loads(row["media_files"]) if row["media_files"] else [],
+            return [
+                {
+                    "username": username,
+                    "content": content,
+                    "timestamp": timestamp,
+                    "has_attachments": bool(has_attachments),
+                    "media_files": json.loads(media_files) if media_files else [],
                 }
-                messages.append(message)
-
-            return messages
+                for username, content, timestamp, has_attachments, media_files in cursor
+            ]
 
     def cleanup_if_database_too_large(self, max_size_gb: float = MAX_DATABASE_SIZE_GB):
         """
@@ -424,7 +568,8 @@ class MessageDatabase:
         Args:
             max_size_gb: Maximum database size in GB before cleanup
         """
-        current_size_mb = self.get_database_size_mb()
+        # Deletes only free pages inside the file until maintenance returns them, so measure the space still in use
+        current_size_mb = self._get_live_size_mb()
         max_size_mb = max_size_gb * MB_PER_GB
 
         if current_size_mb > max_size_mb:
@@ -434,19 +579,27 @@ class MessageDatabase:
             deleted_by_age = self.cleanup_old_messages_by_age(CLEANUP_DAYS_PRIMARY)
 
             # If still too large, clean older messages (older than CLEANUP_DAYS_SECONDARY days)
-            if self.get_database_size_mb() > max_size_mb:
+            if self._get_live_size_mb() > max_size_mb:
                 deleted_by_age += self.cleanup_old_messages_by_age(CLEANUP_DAYS_SECONDARY)
 
             # If still too large, limit per-channel messages
-            if self.get_database_size_mb() > max_size_mb:
+            if self._get_live_size_mb() > max_size_mb:
                 channels = self.get_channels_with_messages()
                 for channel in channels:
                     if channel["message_count"] > MAX_MESSAGES_PER_CHANNEL:
                         self.cleanup_old_messages(channel["channel_id"], CLEANUP_CHANNEL_KEEP_LAST)
 
-            new_size_mb = self.get_database_size_mb()
+            new_size_mb = self._get_live_size_mb()
             print(f"Database cleanup complete. Size: {new_size_mb:.1f}MB")
 
+    def run_maintenance(self):
+        """Return a bounded batch of freed pages, refresh planner statistics and fold the WAL into the database"""
+        with self._lock:
+            # The pragma frees one page per step and execute() only steps it once; executescript runs it to completion
+            self._conn.executescript(f"PRAGMA incremental_vacuum({SQLITE_INCREMENTAL_VACUUM_PAGES})")
+            self._conn.execute("PRAGMA optimize")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
     def get_random_user(
         self, exclude_user_ids: list[str], include_bot_interactions: bool = False
     ) -> dict[str, Any] | None:
@@ -460,14 +613,13 @@ class MessageDatabase:
         Returns:
             Dict with user_id, username, channel_id, and message_count, or None
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._reader() as conn:
             conn.row_factory = sqlite3.Row
             placeholders = ",".join("?" * len(exclude_user_ids))
 
             bot_filter = "" if include_bot_interactions else "AND interacts_with_bot = 0"
 
-            cursor = conn.execute(
-                f"""
+            eligible_groups = f"""
                 SELECT user_id, username, channel_id, COUNT(*) as message_count
                 FROM messages
                 WHERE user_id NOT IN ({placeholders})
@@ -476,13 +628,24 @@ class MessageDatabase:
                   {bot_filter}
                 GROUP BY user_id, channel_id
                 HAVING COUNT(*) >= 5
-                ORDER BY RANDOM()
-                LIMIT 1
-            """,
-                exclude_user_ids,
-            )
+            """
+
+            # Count the eligible groups and seek to a random one rather than sorting them all by RANDOM().
+            # Reader SELECTs run outside a transaction, so pin both to one snapshot or a concurrent delete could
+            # push the offset past the end
+            conn.execute("BEGIN")
+            try:
+                group_count = conn.execute(f"SELECT COUNT(*) FROM ({eligible_groups})", exclude_user_ids).fetchone()[0]
+                if not group_count:
+                    return None
+
+                row = conn.execute(
+                    f"{eligible_groups} LIMIT 1 OFFSET ?",
+                    (*exclude_user_ids, random.randrange(group_count)),
+                ).fetchone()
+            finally:
+                conn.commit()
 
-            row = cursor.fetchone()
             return dict(row) if row else None
 
     def get_user_messages_with_ids(
@@ -491,10 +654,12 @@ class MessageDatabase:
         channel_id: str,
         limit: int = DEFAULT_RECENT_MESSAGES,
         include_bot_interactions: bool = False,
-    ) -> list[dict[str, Any]]:
+    ) -> list[tuple[str, str]]:
         """
         Get recent messages from a specific user in a channel, including discord_message_id
 
+        Only the columns needed to build reply context are fetched.
+
         Args:
             user_id: Discord user ID
             channel_id: Discord channel ID
@@ -502,16 +667,14 @@ class MessageDatabase:
             include_bot_interactions: If False, excludes messages that mention/reply to bot
 
         Returns:
-            List of message dictionaries with discord_message_id included
+            List of (discord_message_id, content) tuples in chronological order
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-
+        with self._reader() as conn:
             bot_filter = "" if include_bot_interactions else "AND interacts_with_bot = 0"
 
             cursor = conn.execute(
                 f"""
-                SELECT username, content, timestamp, discord_message_id, has_attachments, media_files
+                SELECT discord_message_id, content
                 FROM messages
                 WHERE user_id = ? AND channel_id = ?
                   AND content IS NOT NULL
@@ -523,19 +686,9 @@ class MessageDatabase:
                 (user_id, channel_id, limit),
             )
 
-            messages = []
-            for row in cursor.fetchall():
-                message = {
-                    "username": row["username"],
-                    "content": row["content"],
-                    "timestamp": row["timestamp"],
-                    "discord_message_id": row["discord_message_id"],
-                    "has_attachments": bool(row["has_attachments"]),
-                    "media_files": json.loads(row["media_files"]) if row["media_files"] else [],
-                }
-                messages.append(message)
-
-            return list(reversed(messages))
+            messages = cursor.fetchall()
+            messages.reverse()
+            return messages
 
     def cleanup_inaccessible_channels(self, accessible_channel_ids: list[str]) -> int:
         """
@@ -547,7 +700,7 @@ class MessageDatabase:
         Returns:
             Number of channels cleaned up
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             if not accessible_channel_ids:
                 return 0
 
@@ -1,4 +1,7 @@
+from collections import deque
 from datetime import datetime
+from pathlib import Path
+import threading
 from typing import Any
 
 import discord
@@ -6,8 +9,8 @@ import discord
 from database import MessageDatabase
 from utils.config import Config
 from utils.constants import (
-    DB_SIZE_CHECK_INTERVAL,
     MAX_DATABASE_SIZE_GB,
+    MAX_MESSAGE_CONTEXT_FOR_AI,
     MAX_MESSAGES_PER_CHANNEL,
     MB_PER_GB,
     MESSAGES_CLEANUP_MARGIN,
@@ -23,14 +26,19 @@ class MessageStorage:
     Handles message archival and conversation management
     """
 
-    def __init__(self, db_path: str | None = None):
+    def __init__(self, db_path: str | Path | None = None):
         # Use config path by default
         self.db_path = db_path or Config.DATABASE_PATH
         self.db = MessageDatabase(self.db_path)
-        self.last_size_check = datetime.now()
-        self.size_check_interval = DB_SIZE_CHECK_INTERVAL
+        # Per-channel ring buffer of the newest messages, filled lazily from the database on first read
+        self._recent_cache: dict[str, deque[dict[str, Any]]] = {}
+        self._recent_cache_lock = threading.Lock()
         logger.info(f"MessageStorage initialized with database: {self.db_path}")
 
+    def close(self):
+        """Close the underlying database connection"""
+        self.db.close()
+
     def _replace_mentions_with_usernames(self, message: discord.Message) -> str:
         content = message.content or ""
 
@@ -55,17 +63,15 @@ class MessageStorage:
         content = self._replace_mentions_with_usernames(message)
         timestamp = message.created_at
 
-        attachments = []
-        if message.attachments:
-            for attachment in message.attachments:
-                attachments.append(
-                    {
-                        "filename": attachment.filename,
-                        "url": attachment.url,
-                        "content_type": attachment.content_type,
-                        "size": attachment.size,
-                    }
-                )
+        attachments = [
+            {
+                "filename": attachment.filename,
+                "url": attachment.url,
+                "content_type": attachment.content_type,
+                "size": attachment.size,
+            }
+            for attachment in message.attachments
+        ]
 
         # Check if message mentions or replies to the bot
         bot_user_id = str(Config.BOT_USER_ID)
@@ -80,25 +86,36 @@ class MessageStorage:
             interacts_with_bot = str(message.reference.resolved.author.id) == bot_user_id
 
         try:
-            message_id = self.db.store_message(
-                channel_id=channel_id,
-                discord_message_id=discord_message_id,
-                user_id=user_id,
-                username=username,
-                content=content,
-                timestamp=timestamp,
-                attachments=attachments if attachments else None,
-                interacts_with_bot=interacts_with_bot,
-            )
+            # Insert and append under one lock, so a cold load of the buffer cannot pick up this row in between
+            with self._recent_cache_lock:
+                message_id = self.db.store_message(
+                    channel_id=channel_id,
+                    discord_message_id=discord_message_id,
+                    user_id=user_id,
+                    username=username,
+                    content=content,
+                    timestamp=timestamp,
+                    attachments=attachments if attachments else None,
+                    interacts_with_bot=interacts_with_bot,
+                )
 
-            logger.debug(f"Stored message {discord_message_id} from {username} in channel {channel_id}")
+                buffer = self._recent_cache.get(channel_id)
+                if buffer is not None:
+                    buffer.append(
+                        {
+                            "username": username,
+                            "content": content,
+                            "timestamp": str(timestamp),
+                            "has_attachments": bool(attachments),
+                            "media_files": attachments,
+                        }
+                    )
+
+            logger.debug("Stored message %s from %s in channel %s", discord_message_id, username, channel_id)
 
             # Periodic cleanup check
             self.maybe_cleanup_channel(channel_id)
 
-            # Check database size periodically
-            self.maybe_cleanup_database_size()
-
             return message_id
 
         except Exception as e:
@@ -117,13 +134,38 @@ class MessageStorage:
             List of message dictionaries in chronological order
         """
         try:
-            messages = self.db.get_recent_messages(channel_id, limit)
-            logger.debug(f"Retrieved {len(messages)} messages from channel {channel_id}")
+            if limit <= MAX_MESSAGE_CONTEXT_FOR_AI:
+                messages = self._get_cached_recent_messages(channel_id, limit)
+            else:
+                messages = self.db.get_recent_messages(channel_id, limit)
+            logger.debug("Retrieved %d messages from channel %s", len(messages), channel_id)
             return messages
         except Exception as e:
             logger.error(f"Failed to get messages from channel {channel_id}: {e}")
             return []
 
+    def _get_cached_recent_messages(self, channel_id: str, limit: int) -> list[dict[str, Any]]:
+        """Serve recent messages from the ring buffer, loading it from the database on a miss"""
+        with self._recent_cache_lock:
+            buffer = self._recent_cache.get(channel_id)
+            if buffer is None:
+                buffer = deque(
+                    self.db.get_recent_messages(channel_id, MAX_MESSAGE_CONTEXT_FOR_AI),
+                    maxlen=MAX_MESSAGE_CONTEXT_FOR_AI,
+                )
+                self._recent_cache[channel_id] = buffer
+            messages = list(buffer)
+
+        return messages[-limit:] if limit > 0 else []
+
+    def _invalidate_recent_cache(self, channel_id: str | None = None):
+        """Drop cached recent messages for one channel, or for all channels when channel_id is None"""
+        with self._recent_cache_lock:
+            if channel_id is None:
+                self._recent_cache.clear()
+            else:
+                self._recent_cache.pop(channel_id, None)
+
     def get_messages_by_date_range(
         self, channel_id: str, start_date: datetime, end_date: datetime
     ) -> list[dict[str, Any]]:
@@ -161,6 +203,7 @@ class MessageStorage:
         """
         try:
             deleted_count = self.db.delete_recent_messages(channel_id, limit)
+            self._invalidate_recent_cache(channel_id)
             logger.info(f"Deleted {deleted_count} recent messages from channel {channel_id}")
             return deleted_count
         except Exception as e:
@@ -179,6 +222,7 @@ class MessageStorage:
         """
         try:
             deleted_count = self.db.delete_all_channel_messages(channel_id)
+            self._invalidate_recent_cache(channel_id)
             logger.info(
                 f"Deleted ALL {deleted_count} messages from channel {channel_id} and removed conversation record"
             )
@@ -201,22 +245,19 @@ class MessageStorage:
 
     def maybe_cleanup_database_size(self):
         """
-        Check database size and cleanup if needed
-        Only runs once per hour to avoid performance impact
+        Check database size and cleanup if needed, then run routine SQLite maintenance
+        Runs from the bot's background scheduler every DB_SIZE_CHECK_INTERVAL, not per message
         """
-        now = datetime.now()
-        if (now - self.last_size_check) < self.size_check_interval:
-            return
-
-        self.last_size_check = now
-
         try:
             current_size_mb = self.db.get_database_size_mb()
-            logger.debug(f"Database size check: {current_size_mb:.1f}MB")
+            logger.debug("Database size check: %.1fMB", current_size_mb)
 
             if current_size_mb > (MAX_DATABASE_SIZE_GB * MB_PER_GB):
                 logger.warning(f"Database size ({current_size_mb:.1f}MB) approaching limit, starting cleanup")
                 self.db.cleanup_if_database_too_large(MAX_DATABASE_SIZE_GB)
+                self._invalidate_recent_cache()
+
+            self.db.run_maintenance()
 
         except Exception as e:
             logger.error(f"Failed to check database size: {e}")
@@ -227,7 +268,7 @@ class MessageStorage:
             return {
                 "size_mb": self.db.get_database_size_mb(),
                 "total_messages": self.db.get_total_message_count(),
-                "path": self.db_path,
+                "path": str(self.db_path),
             }
         except Exception as e:
             logger.error(f"Failed to get database info: {e}")
@@ -259,32 +300,34 @@ class MessageStorage:
         if not messages:
             return "No recent messages found."
 
-        formatted_lines = []
-        for msg in messages:
-            timestamp = msg["timestamp"]
-            username = msg["username"]
-            content = msg["content"]
-
-            # Format timestamp
-            if isinstance(timestamp, str):
-                # Parse ISO format timestamp
-                try:
-                    dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-                    time_str = dt.strftime("%H:%M")
-                except Exception:
-                    time_str = timestamp[:5]  # Fallback to first 5 chars
-            else:
-                time_str = timestamp.strftime("%H:%M")
+        return "\n".join(
+            f"[{self._format_time(msg['timestamp'])}] {msg['username']}: {msg['content']}{self._media_suffix(msg)}"
+            for msg in messages
+        )
 
-            # Add media info if present
-            media_info = ""
-            if msg.get("has_attachments") and msg.get("media_files"):
-                media_count = len(msg["media_files"])
-                media_info = f" [+{media_count} file{'s' if media_count > 1 else ''}]"
+    @staticmethod
+    def _format_time(timestamp: str | datetime) -> str:
+        """Render a stored or live timestamp as HH:MM"""
+        if not isinstance(timestamp, str):
+            return timestamp.strftime("%H:%M")
 
-            formatted_lines.append(f"[{time_str}] {username}: {content}{media_info}")
+        # ISO timestamps already carry HH:MM at a fixed offset; no need to parse them
+        if len(timestamp) >= 16 and timestamp[10] in "T " and timestamp[13] == ":":
+            return timestamp[11:16]
 
-        return "\n".join(formatted_lines)
+        try:
+            return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).strftime("%H:%M")
+        except Exception:
+            return timestamp[:5]  # Fallback to first 5 chars
+
+    @staticmethod
+    def _media_suffix(msg: dict[str, Any]) -> str:
+        """Describe attached media, if any, as a suffix for the message line"""
+        media_files = msg.get("media_files")
+        if not (msg.get("has_attachments") and media_files):
+            return ""
+        media_count = len(media_files)
+        return f" [+{media_count} file{'s' if media_count > 1 else ''}]"
 
     def cleanup_inaccessible_channels(self, accessible_channel_ids: list[str]) -> int:
         """
@@ -299,6 +342,7 @@ class MessageStorage:
         try:
             cleaned_count = self.db.cleanup_inaccessible_channels(accessible_channel_ids)
             if cleaned_count > 0:
+                self._invalidate_recent_cache()
                 logger.info(f"Cleaned up {cleaned_count} inaccessible channels from database")
             else:
                 logger.debug("No inaccessible channels to clean up")
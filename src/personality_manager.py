@@ -1,6 +1,9 @@
+from collections import OrderedDict
 from datetime import datetime
 import json
+from pathlib import Path
 import sqlite3
+import threading
 from typing import Any, ClassVar
 
 from utils.logger import setup_logger
@@ -11,13 +14,53 @@ logger = setup_logger()
 class PersonalityManager:
     MAX_POINTS: ClassVar[int] = 10
     IMPORTANCE_ORDER: ClassVar[dict[str, int]] = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-
-    def __init__(self, db_path: str):
+    CACHE_SIZE: ClassVar[int] = 1024
+    UPSERT_SQL: ClassVar[str] = """
+        INSERT INTO user_personalities (user_id, username, points, last_updated)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(user_id) DO UPDATE SET
+            username = excluded.username,
+            points = excluded.points,
+            last_updated = excluded.last_updated
+    """
+
+    def __init__(self, db_path: str | Path):
         self.db_path = db_path
+        # One connection for the manager's lifetime; the lock guards it and the cache below across threads
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        # Write-through LRU of personalities by user_id (None for users without one); this class is the only writer
+        self._cache: OrderedDict[str, dict[str, Any] | None] = OrderedDict()
 
     def get_user_personality(self, user_id: str) -> dict[str, Any] | None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._lock:
+            if user_id in self._cache:
+                self._cache.move_to_end(user_id)
+                personality = self._cache[user_id]
+            else:
+                personality = self._load_user_personality(user_id)
+                self._cache_personality(user_id, personality)
+
+        # Callers edit the points list in place (see _apply_deletions), so never hand out the cached one
+        return {**personality, "points": list(personality["points"])} if personality else None
+
+    def close(self):
+        """Close the shared database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _cache_personality(self, user_id: str, personality: dict[str, Any] | None):
+        """Insert into the LRU; the caller holds self._lock"""
+        self._cache[user_id] = personality
+        self._cache.move_to_end(user_id)
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def _load_user_personality(self, user_id: str) -> dict[str, Any] | None:
+        """Read one personality from the database; the caller holds self._lock"""
+        with self._conn as conn:
             cursor = conn.execute(
                 """
                 SELECT user_id, username, points, last_updated
@@ -56,12 +99,17 @@ class PersonalityManager:
             existing_personality = self.get_user_personality(user_id)
 
             if existing_personality:
-                existing_points = existing_personality["points"]
+                # _apply_deletions edits the list in place, so keep the stored points intact for the comparison below
+                existing_points = list(existing_personality["points"])
 
                 if deletions:
                     existing_points = self._apply_deletions(existing_points, deletions, username)
 
                 merged_points = self._prioritize_points(existing_points, new_points, username)
+
+                # Nothing changed, so skip the JSON dump and the write
+                if merged_points == existing_personality["points"] and username == existing_personality["username"]:
+                    return True
             else:
                 merged_points = new_points[: self.MAX_POINTS]
                 for point in merged_points:
@@ -73,20 +121,21 @@ class PersonalityManager:
                     )
 
             points_json = json.dumps(merged_points)
-
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    """
-                    INSERT INTO user_personalities (user_id, username, points, last_updated)
-                    VALUES (?, ?, ?, ?)
-                    ON CONFLICT(user_id) DO UPDATE SET
-                        username = excluded.username,
-                        points = excluded.points,
-                        last_updated = excluded.last_updated
-                """,
-                    (user_id, username, points_json, datetime.now()),
+            last_updated = datetime.now()
+
+            with self._lock:
+                with self._conn as conn:
+                    conn.execute(self.UPSERT_SQL, (user_id, username, points_json, last_updated))
+
+                self._cache_personality(
+                    user_id,
+                    {
+                        "user_id": user_id,
+                        "username": username,
+                        "points": merged_points,
+                        "last_updated": str(last_updated),
+                    },
                 )
-                conn.commit()
 
             return True
 
@@ -94,6 +143,41 @@ class PersonalityManager:
             logger.error(f"Failed to update personality for user {user_id}: {e}")
             return False
 
+    def update_user_personalities(self, entries: list[tuple[str, str, list[dict[str, str]]]]) -> bool:
+        """
+        Replace the personalities of many users at once, e.g. when importing an export
+
+        Args:
+            entries: (user_id, username, points) tuples; points are stored as given, capped at MAX_POINTS
+
+        Returns:
+            True if every entry was written, False if the batch was rolled back
+        """
+        try:
+            last_updated = datetime.now()
+            personalities = [
+                {"user_id": user_id, "username": username, "points": points[: self.MAX_POINTS]}
+                for user_id, username, points in entries
+            ]
+
+            # One transaction for the whole batch, so a single commit instead of one per user
+            with self._lock:
+                with self._conn as conn:
+                    conn.executemany(
+                        self.UPSERT_SQL,
+                        [(p["user_id"], p["username"], json.dumps(p["points"]), last_updated) for p in personalities],
+                    )
+
+                for personality in personalities:
+                    self._cache_personality(personality["user_id"], {**personality, "last_updated": str(last_updated)})
+
+            logger.info(f"Imported personalities for {len(personalities)} users")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to import personalities: {e}")
+            return False
+
     def _apply_deletions(
         self, existing_points: list[dict[str, str]], deletions: list[dict[str, str]], username: str
     ) -> list[dict[str, str]]:
@@ -113,23 +197,20 @@ class PersonalityManager:
     def _prioritize_points(
         self, existing: list[dict[str, str]], new: list[dict[str, str]], username: str
     ) -> list[dict[str, str]]:
-        all_points = []
-
-        for point in existing:
-            all_points.append(point)
+        all_points = list(existing)
+        # Normalized content -> position in all_points, so each new point is matched in one lookup
+        index_by_content = {}
+        for i, point in enumerate(all_points):
+            index_by_content.setdefault(point.get("content", "").lower().strip(), i)
 
         for new_point in new:
             content = new_point.get("content", "").lower().strip()
-            replaced = False
-
-            for i, existing_point in enumerate(all_points):
-                existing_content = existing_point.get("content", "").lower().strip()
-                if content == existing_content:
-                    all_points[i] = new_point
-                    replaced = True
-                    break
+            i = index_by_content.get(content)
 
-            if not replaced:
+            if i is not None:
+                all_points[i] = new_point
+            else:
+                index_by_content[content] = len(all_points)
                 all_points.append(new_point)
                 content = new_point.get("content", "")
                 importance = new_point.get("importance", "unknown")
@@ -147,8 +228,10 @@ class PersonalityManager:
             reverse=True,
         )
 
-        critical_points = [p for p in sorted_points if p.get("importance") == "critical"]
-        non_critical_points = [p for p in sorted_points if p.get("importance") != "critical"]
+        critical_points = []
+        non_critical_points = []
+        for point in sorted_points:
+            (critical_points if point.get("importance") == "critical" else non_critical_points).append(point)
 
         if len(critical_points) >= self.MAX_POINTS:
             logger.warning(f"User has {len(critical_points)} critical points, keeping only first {self.MAX_POINTS}")
@@ -157,12 +240,13 @@ class PersonalityManager:
         remaining_slots = self.MAX_POINTS - len(critical_points)
         return critical_points + non_critical_points[:remaining_slots]
 
-    def format_personality_for_prompt(self, personality: dict[str, Any] | None) -> str:
+    @classmethod
+    def format_personality_for_prompt(cls, personality: dict[str, Any] | None) -> str:
         if not personality or not personality.get("points"):
             return ""
 
         points = personality["points"]
-        lines = [f"\nUser Personality ({len(points)}/{self.MAX_POINTS} points):"]
+        lines = [f"\nUser Personality ({len(points)}/{cls.MAX_POINTS} points):"]
 
         for i, point in enumerate(points, 1):
             importance = point.get("importance", "unknown")
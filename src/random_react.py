@@ -2,12 +2,17 @@ import re
 
 import discord
 
-from utils.config import PROMPT_DIR
-from utils.constants import AI_RANDOM_REPLY_MAX_TOKENS, RANDOM_REACT_MESSAGE_COUNT
+from utils.constants import RANDOM_REACT_MESSAGE_COUNT
 from utils.logger import setup_logger
+from utils.prompts import load_prompt
 
 logger = setup_logger(__name__)
 
+_REACT_PATTERN = re.compile(r"REACT_TO:\s*(\d{1,20})\s*\n\s*(.+)", re.DOTALL)
+# The emoji is taken from the non-ASCII characters before the first ASCII whitespace
+_FIRST_TOKEN_PATTERN = re.compile(r"[^\t\n\x0b\x0c\r\x1c-\x1f ]*")
+_NON_ASCII_PATTERN = re.compile(r"[^\x00-\x7f]+")
+
 
 class RandomReact:
     def __init__(self, bot, ai_client):
@@ -17,13 +22,10 @@ class RandomReact:
 
     async def execute(self, channel):
         try:
-            messages = []
-            async for msg in channel.history(limit=RANDOM_REACT_MESSAGE_COUNT):
-                if msg.author != self.bot.user:
-                    messages.append(msg)
+            messages = await self._get_recent_messages(channel)
 
             if not messages:
-                logger.warning(f"No messages found in channel {channel.id}")
+                logger.warning("No messages found in channel %s", channel.id)
                 return
 
             ai_response = await self._generate_react_with_selection(messages)
@@ -38,11 +40,8 @@ class RandomReact:
                 logger.error(f"Failed to parse AI response: {ai_response[:200]}")
                 return
 
-            target_message = None
-            for msg in messages:
-                if str(msg.id) == target_message_id:
-                    target_message = msg
-                    break
+            messages_by_id = {str(msg.id): msg for msg in messages}
+            target_message = messages_by_id.get(target_message_id)
 
             if not target_message:
                 logger.error(f"Message {target_message_id} not found in recent messages")
@@ -50,7 +49,7 @@ class RandomReact:
 
             try:
                 await target_message.add_reaction(emoji)
-                logger.info(f"Successfully reacted with {emoji} to message {target_message_id}")
+                logger.info("Successfully reacted with %s to message %s", emoji, target_message_id)
             except discord.HTTPException as e:
                 logger.error(f"Failed to add reaction {emoji}: {e}")
                 return
@@ -58,57 +57,56 @@ class RandomReact:
         except Exception as e:
             logger.error(f"Error in random react: {e}", exc_info=True)
 
+    async def _get_recent_messages(self, channel) -> list[discord.Message]:
+        """
+        Get the channel's most recent messages (newest first), excluding the bot's own
+
+        Reacts fire right after RANDOM_REACT_MESSAGE_COUNT messages arrive over the gateway, so they are
+        normally still in the client's message cache; only fall back to a history fetch when they are not.
+        """
+        recent = []
+        for msg in reversed(self.bot.cached_messages):
+            if msg.channel.id == channel.id:
+                recent.append(msg)
+                if len(recent) >= RANDOM_REACT_MESSAGE_COUNT:
+                    break
+
+        if len(recent) < RANDOM_REACT_MESSAGE_COUNT:
+            recent = [msg async for msg in channel.history(limit=RANDOM_REACT_MESSAGE_COUNT)]
+
+        return [msg for msg in recent if msg.author != self.bot.user]
+
     async def _generate_react_with_selection(self, messages: list[discord.Message]) -> str | None:
         try:
-            if not self.ai_client.is_available():
-                logger.error("AI client is not available")
-                return None
-
-            prompt = self.prompt
-
-            context_parts = ["Recent messages in this channel:\n"]
-            for msg in reversed(messages):
-                message_id = msg.id
-                username = msg.author.display_name
-                content = msg.content or "[no text content]"
-
-                reactions_str = ""
-                if msg.reactions:
-                    reaction_list = []
-                    for reaction in msg.reactions:
-                        reaction_list.append(f"{reaction.emoji}x{reaction.count}")
-                    reactions_str = f" [Reactions: {', '.join(reaction_list)}]"
-
-                context_parts.append(f"[ID: {message_id}] {username}: {content}{reactions_str}")
-
-            formatted_context = "\n".join(context_parts)
-
-            ai_response = await self.ai_client._generate_with_config(
-                formatted_context=formatted_context,
-                system_prompt=prompt,
-                image_urls=None,
-                enable_tools=False,
-                temperature=1.0,
-                max_tokens=AI_RANDOM_REPLY_MAX_TOKENS,
+            formatted_context = "Recent messages in this channel:\n\n" + "\n".join(
+                self._format_message(msg) for msg in reversed(messages)
             )
 
-            return ai_response
+            return await self.ai_client.generate_selection_response(formatted_context, self.prompt)
 
         except Exception as e:
             logger.error(f"Error generating react: {e}")
             return None
 
+    @staticmethod
+    def _format_message(msg: discord.Message) -> str:
+        reactions = msg.reactions
+        reactions_str = (
+            f" [Reactions: {', '.join(f'{reaction.emoji}x{reaction.count}' for reaction in reactions)}]"
+            if reactions
+            else ""
+        )
+        return f"[ID: {msg.id}] {msg.author.display_name}: {msg.content or '[no text content]'}{reactions_str}"
+
     def _load_prompt(self) -> str:
         try:
-            prompt_path = PROMPT_DIR / "random_react.txt"
-            if prompt_path.exists():
-                return prompt_path.read_text().strip()
-            else:
-                logger.warning("random_react.txt not found, using default prompt")
-                return (
-                    "You are Frank. Pick a single emoji that best reacts to this message. "
-                    "Respond with ONLY the emoji character, nothing else."
-                )
+            return load_prompt("random_react.txt")
+        except FileNotFoundError:
+            logger.warning("random_react.txt not found, using default prompt")
+            return (
+                "You are Frank. Pick a single emoji that best reacts to this message. "
+                "Respond with ONLY the emoji character, nothing else."
+            )
         except Exception as e:
             logger.error(f"Error loading random react prompt: {e}")
             return (
@@ -117,17 +115,16 @@ class RandomReact:
             )
 
     def _parse_ai_response(self, response: str) -> tuple[str | None, str | None]:
-        match = re.match(r"REACT_TO:\s*(\d+)\s*\n\s*(.+)", response, re.DOTALL)
+        if not response.startswith("REACT_TO:"):
+            return None, None
+
+        match = _REACT_PATTERN.match(response)
         if match:
             message_id = match.group(1).strip()
             emoji_line = match.group(2).strip()
 
-            emoji = ""
-            for char in emoji_line:
-                if ord(char) > 127:
-                    emoji += char
-                elif char.isspace():
-                    break
+            first_token = _FIRST_TOKEN_PATTERN.match(emoji_line).group(0)
+            emoji = "".join(_NON_ASCII_PATTERN.findall(first_token))
 
             if not emoji:
                 emoji = emoji_line.split()[0] if emoji_line else ""
@@ -2,11 +2,12 @@
 
 import os
 from pathlib import Path
+from typing import Final
 
 from dotenv import load_dotenv
 
-# Get project root directory
-PROJECT_ROOT = Path.cwd()
+# Project root resolved from this file (src/utils/config.py), so it does not depend on the working directory
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
 # Load environment variables from project root
 load_dotenv(PROJECT_ROOT / ".env")
@@ -17,30 +18,34 @@ CONVERSATION_PROMPT_PATH = PROMPT_DIR / "conversation.txt"
 SUMMARIZE_PROMPT_PATH = PROMPT_DIR / "summarize.txt"
 PERSONALITY_PROMPT_PATH = PROMPT_DIR / "personality.txt"
 
+# Default storage paths, used when the environment does not override them
+DEFAULT_DATABASE_PATH = PROJECT_ROOT / "data" / "conversations.db"
+DEFAULT_LOG_FILE_PATH = PROJECT_ROOT / "data" / "logs" / "bot.log"
+
 
 class Config:
     """Configuration settings for the bot"""
 
     # Discord Configuration
-    DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
-    BOT_USER_ID = int(os.getenv("BOT_USER_ID", "0"))
-    DAN_USER_ID = int(os.getenv("DAN_USER_ID", "0"))
+    DISCORD_TOKEN: Final[str | None] = os.getenv("DISCORD_TOKEN")
+    BOT_USER_ID: Final[int] = int(os.getenv("BOT_USER_ID", "0"))
+    DAN_USER_ID: Final[int] = int(os.getenv("DAN_USER_ID", "0"))
 
     # AI API Configuration
-    AI_API_KEY = os.getenv("GEMINI_API_KEY")
-    AI_API_BASE_URL = os.getenv("AI_API_BASE_URL", "https://generativelanguage.googleapis.com/v1")
-    AI_MODEL = os.getenv("AI_MODEL", "gemini-2.5-flash")
+    AI_API_KEY: Final[str | None] = os.getenv("GEMINI_API_KEY")
+    AI_API_BASE_URL: Final[str] = os.getenv("AI_API_BASE_URL", "https://generativelanguage.googleapis.com/v1")
+    AI_MODEL: Final[str] = os.getenv("AI_MODEL", "gemini-2.5-flash")
 
     # Storage Configuration (absolute paths from project root)
-    DATABASE_PATH = os.getenv("DATABASE_PATH", str(PROJECT_ROOT / "data" / "conversations.db"))
-    LOG_FILE_PATH = os.getenv("LOG_FILE_PATH", str(PROJECT_ROOT / "data" / "logs" / "bot.log"))
+    DATABASE_PATH: Final[Path] = Path(os.getenv("DATABASE_PATH") or DEFAULT_DATABASE_PATH)
+    LOG_FILE_PATH: Final[Path] = Path(os.getenv("LOG_FILE_PATH") or DEFAULT_LOG_FILE_PATH)
 
     # Logging
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    DEBUG_MODE = os.getenv("DEBUG_MODE", "false").lower() == "true"
+    LOG_LEVEL: Final[str] = os.getenv("LOG_LEVEL", "INFO")
+    DEBUG_MODE: Final[bool] = os.getenv("DEBUG_MODE", "false").lower() == "true"
 
     # Personality Feature
-    ENABLE_PERSONALITY_FEATURE = os.getenv("ENABLE_PERSONALITY_FEATURE", "true").lower() == "true"
+    ENABLE_PERSONALITY_FEATURE: Final[bool] = os.getenv("ENABLE_PERSONALITY_FEATURE", "true").lower() == "true"
 
     @classmethod
     def validate(cls):
@@ -51,6 +56,6 @@ class Config:
         if missing:
             raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
 
-        # Create directories if they don't exist
-        Path(cls.DATABASE_PATH).parent.mkdir(parents=True, exist_ok=True)
-        Path(cls.LOG_FILE_PATH).parent.mkdir(parents=True, exist_ok=True)
+        # Create directories if they don't exist (once each, as the paths may share a parent)
+        for directory in {cls.DATABASE_PATH.parent, cls.LOG_FILE_PATH.parent}:
+            directory.mkdir(parents=True, exist_ok=True)
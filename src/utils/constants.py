@@ -11,6 +11,9 @@ CLEANUP_CHANNEL_KEEP_LAST = 500
 CLEANUP_DAYS_PRIMARY = 30
 CLEANUP_DAYS_SECONDARY = 7
 DB_SIZE_CHECK_INTERVAL = timedelta(hours=1)
+SQLITE_MMAP_SIZE_BYTES = 256 * 1024 * 1024
+SQLITE_CACHE_SIZE_KB = 64 * 1024
+SQLITE_INCREMENTAL_VACUUM_PAGES = 16384  # Free pages returned to the filesystem per maintenance run
 
 # Conversion Constants
 BYTES_PER_MB = 1024 * 1024
@@ -2,7 +2,6 @@
 
 import logging
 from logging.handlers import RotatingFileHandler
-from pathlib import Path
 import sys
 
 from .config import Config
@@ -32,9 +31,8 @@ def setup_logger(name: str = "frank_bot") -> logging.Logger:
     logger.addHandler(console_handler)
 
     # Rotating file handler
-    log_file = Path(Config.LOG_FILE_PATH)
     file_handler = RotatingFileHandler(
-        log_file, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUP_COUNT, encoding="utf-8"
+        Config.LOG_FILE_PATH, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUP_COUNT, encoding="utf-8"
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(detailed_formatter)
@@ -0,0 +1,16 @@
+"""Prompt file loading for Frank the Chatter bot"""
+
+from functools import lru_cache
+
+from .config import PROMPT_DIR
+
+
+@lru_cache(maxsize=16)
+def load_prompt(prompt_file: str) -> str:
+    """
+    Read a prompt file from the prompts directory
+
+    Results are cached for the life of the process; call load_prompt.cache_clear() after editing a prompt.
+    Missing or unreadable files raise, and failures are not cached.
+    """
+    return (PROMPT_DIR / prompt_file).read_text().strip()
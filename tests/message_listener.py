@@ -1,5 +1,5 @@
-from datetime import datetime
 import os
+import time
 
 import discord
 from dotenv import load_dotenv
@@ -13,6 +13,10 @@ if not TOKEN:
 
 
 class MessageListener(discord.Client):
+    def __init__(self, log_file, **options):
+        super().__init__(**options)
+        self.log_file = log_file
+
     async def on_ready(self):
         print(f"Bot logged in as {self.user}!")
         print("Listening for messages across all accessible channels")
@@ -21,23 +25,19 @@ class MessageListener(discord.Client):
         if message.author == self.user:
             return
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
         author = f"{message.author.display_name} (@{message.author.name})"
-        channel_info = (
-            f"#{message.channel.name}" if hasattr(message.channel, "name") else f"Channel {message.channel.id}"
-        )
-        content = message.content
-
-        if message.attachments:
-            for attachment in message.attachments:
-                content += f" [Image: {attachment.url}]"
+        channel_name = getattr(message.channel, "name", None)
+        channel_info = f"#{channel_name}" if channel_name else f"Channel {message.channel.id}"
+        content = message.content + "".join(f" [Image: {attachment.url}]" for attachment in message.attachments)
 
         log_entry = f"[{timestamp}] {channel_info} {author}: {content}"
         print(log_entry)
 
-        with open("../data/logs/message_log.txt", "a", encoding="utf-8") as f:
-            f.write(log_entry + "\n")
+        self.log_file.write(log_entry + "\n")
 
 
-client = MessageListener()
-client.run(TOKEN)
+# One handle for the whole session; line buffering still lets the log be tailed live
+with open("../data/logs/message_log.txt", "a", encoding="utf-8", buffering=1) as log_file:
+    client = MessageListener(log_file)
+    client.run(TOKEN)
@@ -17,12 +17,9 @@ logger = setup_logger()
 class AIClientTester:
     def __init__(self):
         self.client = AIClient()
-        self.logs = []
 
     def log_data(self, label, data):
-        entry = f"\n{'='*80}\n{label}\n{'='*80}\n{data}\n"
-        self.logs.append(entry)
-        print(entry)
+        print(f"\n{'='*80}\n{label}\n{'='*80}\n{data}\n")
 
     async def test_generate_response(self):
         context_messages = [
@@ -1,17 +1,31 @@
 #!/usr/bin/env python3
 """Diagnostic script to test Gemini API responses in group chat context"""
 
+import asyncio
 from pathlib import Path
 import sys
 
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
-import google.genai as genai
-from google.genai import types
-
 from database import MessageDatabase
 from utils.config import Config
 from utils.constants import AI_MAX_TOKENS
+from utils.prompts import load_prompt
+
+
+def run_attempts(client, contents, config, attempts: int = 5) -> list:
+    """Send the same request several times concurrently; returns responses or exceptions in attempt order"""
+
+    async def gather_attempts():
+        return await asyncio.gather(
+            *(
+                client.aio.models.generate_content(model=Config.AI_MODEL, contents=contents, config=config)
+                for _ in range(attempts)
+            ),
+            return_exceptions=True,
+        )
+
+    return asyncio.run(gather_attempts())
 
 
 def test_with_actual_context():
@@ -22,6 +36,10 @@ def test_with_actual_context():
         print("ERROR: No GEMINI_API_KEY found")
         return
 
+    # Deferred so the key check above fails fast without loading the SDK
+    import google.genai as genai
+    from google.genai import types
+
     client = genai.Client(api_key=Config.AI_API_KEY)
 
     # Get actual group chat context
@@ -41,29 +59,27 @@ def test_with_actual_context():
     recent = db.get_recent_messages(group_channel_id, 25)
     print(f"Retrieved {len(recent)} messages for context\n")
 
-    # Format context like the bot does
-    context_parts = []
-    if recent:
-        context_parts.append("Recent conversation context:")
-        for msg in recent[-10:]:  # Last 10 messages
-            username = msg.get("username", "Unknown")
-            content = msg.get("content", "")
-            if content.strip():
-                context_parts.append(f"{username}: {content}")
-
-    context_parts.append("\ntarquin_dan just mentioned you with: @frank what's up?")
-    context_parts.append("\nPlease respond as Frank to tarquin_dan.")
-
-    formatted_context = "\n".join(context_parts)
+    # Format context like the bot does, from the last 10 messages
+    history = "".join(
+        f"{msg.get('username', 'Unknown')}: {content}\n"
+        for msg in recent[-10:]
+        if (content := msg.get("content", "")).strip()
+    )
+    header = f"Recent conversation context:\n{history}" if recent else ""
+    formatted_context = (
+        f"{header}\ntarquin_dan just mentioned you with: @frank what's up?\n\nPlease respond as Frank to tarquin_dan."
+    )
 
     print("Context length:", len(formatted_context), "chars\n")
     print("--- CONTEXT START ---")
     print(formatted_context[:500], "..." if len(formatted_context) > 500 else "")
     print("--- CONTEXT END ---\n")
 
-    # Load system prompt
-    prompt_path = Path(__file__).parent / "config" / "prompt.txt"
-    system_prompt = prompt_path.read_text().strip() if prompt_path.exists() else "You are Frank"
+    # Load the same (cached) system prompt the bot uses
+    try:
+        system_prompt = load_prompt("conversation.txt")
+    except OSError:
+        system_prompt = "You are Frank"
 
     print(f"System prompt length: {len(system_prompt)} chars\n")
 
@@ -82,32 +98,28 @@ def test_with_actual_context():
     )
 
     print("=== Test 1: With Tools (Current Config) ===")
-    for attempt in range(5):
+    for attempt, response in enumerate(run_attempts(client, formatted_context, config_with_tools)):
+        if isinstance(response, Exception):
+            print(f"Attempt {attempt + 1}: API ERROR - {response}")
+            continue
+
+        # Try to access text
         try:
-            response = client.models.generate_content(
-                model=Config.AI_MODEL, contents=formatted_context, config=config_with_tools
-            )
-
-            # Try to access text
-            try:
-                text = response.text if hasattr(response, "text") else None
-                if text:
-                    print(f"Attempt {attempt + 1}: SUCCESS - {len(text)} chars")
-                else:
-                    print(f"Attempt {attempt + 1}: EMPTY - No text")
-                    if hasattr(response, "candidates") and response.candidates:
-                        candidate = response.candidates[0]
-                        print(f"  Finish reason: {candidate.finish_reason}")
-                        if hasattr(candidate, "safety_ratings"):
-                            print(f"  Safety ratings: {candidate.safety_ratings}")
-            except Exception as e:
-                print(f"Attempt {attempt + 1}: ERROR accessing text - {e}")
+            text = response.text if hasattr(response, "text") else None
+            if text:
+                print(f"Attempt {attempt + 1}: SUCCESS - {len(text)} chars")
+            else:
+                print(f"Attempt {attempt + 1}: EMPTY - No text")
                 if hasattr(response, "candidates") and response.candidates:
                     candidate = response.candidates[0]
                     print(f"  Finish reason: {candidate.finish_reason}")
-
+                    if hasattr(candidate, "safety_ratings"):
+                        print(f"  Safety ratings: {candidate.safety_ratings}")
         except Exception as e:
-            print(f"Attempt {attempt + 1}: API ERROR - {e}")
+            print(f"Attempt {attempt + 1}: ERROR accessing text - {e}")
+            if hasattr(response, "candidates") and response.candidates:
+                candidate = response.candidates[0]
+                print(f"  Finish reason: {candidate.finish_reason}")
 
     print("\n=== Test 2: Without Tools ===")
     config_no_tools = types.GenerateContentConfig(
@@ -118,24 +130,20 @@ def test_with_actual_context():
         top_k=20,
     )
 
-    for attempt in range(5):
-        try:
-            response = client.models.generate_content(
-                model=Config.AI_MODEL, contents=formatted_context, config=config_no_tools
-            )
-
-            try:
-                text = response.text if hasattr(response, "text") else None
-                if text:
-                    print(f"Attempt {attempt + 1}: SUCCESS - {len(text)} chars")
-                    print(f"  Preview: {text[:100]}")
-                else:
-                    print(f"Attempt {attempt + 1}: EMPTY")
-            except Exception as e:
-                print(f"Attempt {attempt + 1}: ERROR - {e}")
+    for attempt, response in enumerate(run_attempts(client, formatted_context, config_no_tools)):
+        if isinstance(response, Exception):
+            print(f"Attempt {attempt + 1}: API ERROR - {response}")
+            continue
 
+        try:
+            text = response.text if hasattr(response, "text") else None
+            if text:
+                print(f"Attempt {attempt + 1}: SUCCESS - {len(text)} chars")
+                print(f"  Preview: {text[:100]}")
+            else:
+                print(f"Attempt {attempt + 1}: EMPTY")
         except Exception as e:
-            print(f"Attempt {attempt + 1}: API ERROR - {e}")
+            print(f"Attempt {attempt + 1}: ERROR - {e}")
 
 
 if __name__ == "__main__":
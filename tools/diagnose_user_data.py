@@ -7,6 +7,7 @@ import discord
 
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 import json
+import logging
 
 from utils.config import Config
 from utils.logger import setup_logger
@@ -17,47 +18,56 @@ logger = setup_logger()
 class DiagnosticBot(discord.Client):
     def __init__(self):
         super().__init__(enable_debug_events=True)
+        self._reflected_types: set[type] = set()
 
     async def on_ready(self):
-        logger.info(f"Bot ready as {self.user}")
+        logger.info("Bot ready as %s", self.user)
         logger.info("Send a DM to see what data Discord provides...")
 
     async def on_socket_raw_receive(self, msg):
         try:
-            if isinstance(msg, bytes):
+            # Most gateway frames are heartbeats, presence and typing events; skip them before parsing
+            if isinstance(msg, bytes) or '"MESSAGE_CREATE"' not in msg:
                 return
             data = json.loads(msg)
             if data.get("t") == "MESSAGE_CREATE":
                 author = data.get("d", {}).get("author", {})
                 logger.info("\n=== RAW MESSAGE_CREATE AUTHOR DATA ===")
-                logger.info(json.dumps(author, indent=2))
-                logger.info(f"\nKeys available: {list(author.keys())}")
-                logger.info(f"Username: {author.get('username')}")
-                logger.info(f"Global name: {author.get('global_name')}")
-                logger.info(f"Discriminator: {author.get('discriminator')}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(json.dumps(author, indent=2))
+                logger.info("\nKeys available: %s", list(author.keys()))
+                logger.info("Username: %s", author.get("username"))
+                logger.info("Global name: %s", author.get("global_name"))
+                logger.info("Discriminator: %s", author.get("discriminator"))
         except Exception as e:
-            logger.error(f"Error in socket handler: {e}")
+            logger.error("Error in socket handler: %s", e)
 
     async def on_message(self, message):
         if message.author == self.user:
             return
         logger.info("\n=== PARSED MESSAGE OBJECT ===")
-        logger.info(f"message.author type: {type(message.author)}")
-        logger.info(f"message.author.__class__.__name__: {message.author.__class__.__name__}")
-        logger.info(f"message.author.name: {message.author.name}")
-        logger.info(f"message.author.display_name: {message.author.display_name}")
-        logger.info(f"message.author.discriminator: {message.author.discriminator}")
-        logger.info(f"Has global_name attr: {hasattr(message.author, 'global_name')}")
-        logger.info(
-            "message.author.__slots__: %s",
-            message.author.__slots__ if hasattr(message.author, "__slots__") else "No slots",
-        )
-        logger.info(f"dir(message.author): {[a for a in dir(message.author) if 'global' in a.lower()]}")
+        # Introspect each author class (User in DMs, Member in guilds) once rather than per message
+        if type(message.author) not in self._reflected_types:
+            self._reflected_types.add(type(message.author))
+            self._log_reflection(message.author)
+        logger.info("message.author.name: %s", message.author.name)
+        logger.info("message.author.display_name: %s", message.author.display_name)
+        logger.info("message.author.discriminator: %s", message.author.discriminator)
         try:
             gn = getattr(message.author, "global_name", "ATTRIBUTE_NOT_FOUND")
-            logger.info(f"getattr global_name: {gn}")
+            logger.info("getattr global_name: %s", gn)
         except Exception as e:
-            logger.info(f"Error getting global_name: {e}")
+            logger.info("Error getting global_name: %s", e)
+
+    def _log_reflection(self, author):
+        logger.info("message.author type: %s", type(author))
+        logger.info("message.author.__class__.__name__: %s", author.__class__.__name__)
+        logger.info("Has global_name attr: %s", hasattr(author, "global_name"))
+        logger.info(
+            "message.author.__slots__: %s",
+            author.__slots__ if hasattr(author, "__slots__") else "No slots",
+        )
+        logger.info("dir(message.author): %s", [a for a in dir(author) if "global" in a.lower()])
 
 
 if __name__ == "__main__":
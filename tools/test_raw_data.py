@@ -7,6 +7,7 @@ import discord
 
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 import json
+import logging
 
 from utils.config import Config
 from utils.logger import setup_logger
@@ -20,9 +21,10 @@ class RawDataBot(discord.Client):
             author_data = msg.get("d", {}).get("author", {})
             if "global_name" in author_data:
                 logger.info("\n=== Found global_name in raw data! ===")
-                logger.info(f"Username: {author_data.get('username')}")
-                logger.info(f"Global Name: {author_data.get('global_name')}")
-                logger.info(f"Full author data: {json.dumps(author_data, indent=2)}")
+                logger.info("Username: %s", author_data.get("username"))
+                logger.info("Global Name: %s", author_data.get("global_name"))
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Full author data: %s", json.dumps(author_data, indent=2))
 
 
 if __name__ == "__main__":